@@ -1,23 +1,65 @@
 #%%
 import streamlit as st
 import plotly
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from pathlib import Path
-from utils.utils import get_data_path
+from utils.datastore import read_datasets
+from utils.ticker_index import TickerIndex
+from utils.cube import FundamentalsCube
+from utils.tables import show_table
+from utils.valuation import ValuationStats
+from utils.figures import axis_refs, build_figure, grid_template, scatter_type
 from datetime import datetime
 
 #%% Data preparation
-@st.cache_data
+# Row order of each dataset: ticker, then the column(s) its TickerIndex sorts by
+TICKER_ORDER = {
+    'FA': ['TICKER', 'YEAR'],
+    'VAL': ['TICKER', 'TRADE_DATE'],
+    'MCAP': ['TICKER', 'TRADE_DATE'],
+    'BANK': ['TICKER', 'YEARREPORT', 'DATE'],
+}
+
+@st.cache_resource
 def load_data():
-    df = pd.read_csv(get_data_path("FA_processed.csv"))
-    val = pd.read_csv(get_data_path("Val_processed.csv"))
-    mcap = pd.read_csv(get_data_path("MktCap_processed.csv"))
-    bank = pd.read_csv(get_data_path("BankSupp_processed.csv"))
+    # Columnar cache of the CSVs, read concurrently; shared uncopied, as the frames are memory-mapped.
+    # Rows are cached in TickerIndex order, so the indexes below slice these frames without copying them
+    df, val, mcap, bank = read_datasets(
+        ("FA_processed.csv", {'sort_by': TICKER_ORDER['FA']}),
+        ("Val_processed.csv", {'sort_by': TICKER_ORDER['VAL']}),
+        ("MktCap_processed.csv", {'sort_by': TICKER_ORDER['MCAP']}),
+        ("BankSupp_processed.csv", {'sort_by': TICKER_ORDER['BANK']}),
+    )
     return df, val, mcap, bank
 
-df, val, mcap, bank = load_data()
+@st.cache_resource
+def load_ticker_indexes():
+    # Built once per process and shared by all sessions; slices are read-only views
+    df, val, mcap, bank = load_data()
+    return (
+        TickerIndex(df, sort_by=TICKER_ORDER['FA'][1:]),
+        TickerIndex(val, sort_by=TICKER_ORDER['VAL'][1:]),
+        TickerIndex(mcap, sort_by=TICKER_ORDER['MCAP'][1:]),
+        TickerIndex(bank, sort_by=TICKER_ORDER['BANK'][1:]),
+    )
+
+@st.cache_resource
+def load_fundamentals_cube():
+    # Dense ticker x keycode x period VALUE/YoY arrays, pivoted once per process
+    df, _, _, _ = load_data()
+    return FundamentalsCube(df, fields=('VALUE', 'YoY'))
+
+@st.cache_resource
+def load_valuation_stats():
+    # Latest value, mean/std, percentiles and rolling bands of every ticker's multiples
+    _, val, _, _ = load_ticker_indexes()
+    return ValuationStats(val)
+
+df, val, mcap, bank = load_ticker_indexes()
+fa_cube = load_fundamentals_cube()
+val_stats = load_valuation_stats()
 
 IS = ['Net_Revenue','Gross_Profit', 'EBIT', 'EBITDA',  'NPATMI']
 MARGIN = ['Gross_Margin', 'EBIT_Margin', 'EBITDA_Margin','NPAT_Margin']
@@ -28,6 +70,9 @@ BS = [
 ]
 CF = ['Operating_CF', 'Dep_Expense', 'Inv_CF', 'Capex', 'Fin_CF', 'FCF']
 
+# Display units of the financial table rows (values are in VND bn or percent)
+FS_UNITS = {**{k: 'bn' for k in IS + BS + CF}, **{f"{k}_Gr": '%' for k in IS}, **{k: '%' for k in MARGIN}}
+
 IS_ORDER = [
     "Net_Revenue", "Net_Revenue_Gr", "Gross_Profit", "Gross_Profit_Gr", "Gross_Margin",
     "EBIT", "EBIT_Gr", "EBIT_Margin", "EBITDA", "EBITDA_Gr", "EBITDA_Margin",
@@ -35,33 +80,28 @@ IS_ORDER = [
 ]
 
 #%% Financial data table
-def process_section(df_ticker, section, section_name, margin_section=False):
-    df_section = df_ticker[df_ticker['KEYCODE'].isin(section)]
-    section_table = df_section.pivot(index='KEYCODE', columns='DATE', values='VALUE')
-    section_table = section_table.reindex(section)
+def process_section(cube, ticker, section, section_name, margin_section=False, start_year=None):
+    section_table = cube.block(ticker, 'VALUE', section, since=start_year)
+    # Whole-table scaling; units and number formats are applied at display time
     if margin_section:
-        section_table = section_table.map(lambda x: f"{x*100:.1f}%")
+        section_table = section_table * 100
     else:
-        section_table = section_table.map(lambda x: f"{x/1e9:,.1f}")
+        section_table = section_table / 1e9
     section_table.insert(0, 'SECTION', section_name)
     return section_table
 
-def process_growth(df_ticker, section, section_name, IS_growth):
-    df_growth = df_ticker[df_ticker['KEYCODE'].isin(section)]
-    growth_table = df_growth.pivot(index='KEYCODE', columns='DATE', values='YoY')
-    growth_table = growth_table.reindex(section)
+def process_growth(cube, ticker, section, section_name, IS_growth, start_year=None):
+    growth_table = cube.block(ticker, 'YoY', section, since=start_year)
     growth_table = growth_table.rename(index=IS_growth)
-    growth_table = growth_table.map(lambda x: f"{x*100:.1f}%")
+    growth_table = growth_table * 100
     growth_table.insert(0, 'SECTION', section_name)
     return growth_table
 
-def create_fs_table_main(df, ticker: str) -> pd.DataFrame:
-    df_temp = df.copy()
-    df_ticker = df_temp[df_temp['TICKER'] == ticker]
+def create_fs_table_main(cube, ticker: str, start_year=None) -> pd.DataFrame:
     IS_growth = {i: f"{i}_Gr" for i in IS}
-    IS_table = process_section(df_ticker, IS, 'IS')
-    GR_table = process_growth(df_ticker, IS, 'IS_GROWTH', IS_growth)
-    MARGIN_table = process_section(df_ticker, MARGIN, 'MARGIN', margin_section=True)
+    IS_table = process_section(cube, ticker, IS, 'IS', start_year=start_year)
+    GR_table = process_growth(cube, ticker, IS, 'IS_GROWTH', IS_growth, start_year=start_year)
+    MARGIN_table = process_section(cube, ticker, MARGIN, 'MARGIN', margin_section=True, start_year=start_year)
     fs_table = pd.concat([IS_table, GR_table, MARGIN_table])
     fs_table = fs_table.drop(columns='SECTION')
     fs_table = fs_table.reindex(index=IS_ORDER)
@@ -69,33 +109,20 @@ def create_fs_table_main(df, ticker: str) -> pd.DataFrame:
 
 #%% Plotting key FA data
 def create_subplot_figure(df_ticker, plot_cols, ma, subplot_titles, yaxis_suffix, title, rows, colors):
-    fig = make_subplots(rows=rows, cols=2, subplot_titles=subplot_titles)
+    layout = grid_template(rows, 2, tuple(subplot_titles), height=400 * rows, width=1200,
+                           yaxis_suffix=yaxis_suffix, template="plotly_white")
+    x = df_ticker.index.to_numpy()
+    traces = []
     for idx, col in enumerate(plot_cols):
-        row = idx // 2 + 1
-        col_pos = idx % 2 + 1
+        refs = axis_refs(idx // 2 + 1, idx % 2 + 1, cols=2)
         color = colors[idx % len(colors)]
-        fig.add_trace(
-            go.Bar(x=df_ticker.index, y=df_ticker[col], name=col, marker_color=color),
-            row=row, col=col_pos
-        )
-        fig.add_trace(
-            go.Scatter(x=df_ticker.index, y=ma[col], mode='lines', name=f'{col} MA(4)', line=dict(color='red')),
-            row=row, col=col_pos
-        )
-    fig.update_layout(
-        title_text=title,
-        showlegend=False,
-        height=400 * rows,
-        width=1200,
-        template="plotly_white"
-    )
-    fig.update_yaxes(ticksuffix=yaxis_suffix)
-    return fig
+        traces.append(dict(type='bar', x=x, y=df_ticker[col].to_numpy(), name=col, marker=dict(color=color), **refs))
+        traces.append(dict(type='scatter', x=x, y=ma[col].to_numpy(), mode='lines', name=f'{col} MA(4)',
+                           line=dict(color='red'), **refs))
+    return build_figure(layout, traces, title=dict(text=title))
 
-def create_FA_plots(df, ticker: str):
-    df_temp = df.copy()
-    df_ticker = df_temp[(df_temp.TICKER == ticker) & (df_temp.KEYCODE.isin(IS))]
-    df_ticker = df_ticker.pivot(index='DATE', columns='KEYCODE', values='VALUE') / 1e9
+def create_FA_plots(cube, ticker: str, start_year=None):
+    df_ticker = cube.block(ticker, 'VALUE', IS, since=start_year, dropna=True).T / 1e9
     plot_cols = [col for col in ['Net_Revenue', 'Gross_Profit', 'EBIT', 'NPATMI'] if col in df_ticker.columns]
     if not plot_cols:
         return go.Figure()
@@ -105,10 +132,8 @@ def create_FA_plots(df, ticker: str):
     colors = ['royalblue', 'darkorange', 'green', 'gray']
     return create_subplot_figure(df_ticker, plot_cols, ma, subplot_titles, "bn", "Income Statement Overview - " + ticker, rows, colors)
 
-def create_gr_plots(df, ticker: str):
-    df_temp = df.copy()
-    df_ticker = df_temp[(df_temp.TICKER == ticker) & (df_temp.KEYCODE.isin(IS))]
-    df_ticker = df_ticker.pivot(index='DATE', columns='KEYCODE', values='YoY') * 100
+def create_gr_plots(cube, ticker: str, start_year=None):
+    df_ticker = cube.block(ticker, 'YoY', IS, since=start_year, dropna=True).T * 100
     plot_cols = [col for col in ['Net_Revenue', 'Gross_Profit', 'EBIT', 'NPATMI'] if col in df_ticker.columns]
     if not plot_cols:
         return go.Figure()
@@ -118,10 +143,8 @@ def create_gr_plots(df, ticker: str):
     colors = ['royalblue', 'darkorange', 'green', 'gray']
     return create_subplot_figure(df_ticker, plot_cols, ma, subplot_titles, "%", "Income Statement Overview - " + ticker, rows, colors)
 
-def create_margin_plots(df, ticker: str):
-    df_temp = df.copy()
-    df_ticker = df_temp[(df_temp.TICKER == ticker) & (df_temp.KEYCODE.isin(MARGIN))]
-    df_ticker = df_ticker.pivot(index='DATE', columns='KEYCODE', values='VALUE') * 100
+def create_margin_plots(cube, ticker: str, start_year=None):
+    df_ticker = cube.block(ticker, 'VALUE', MARGIN, since=start_year, dropna=True).T * 100
     plot_cols = [col for col in ['Gross_Margin', 'EBIT_Margin', 'EBITDA_Margin', 'NPAT_Margin'] if col in df_ticker.columns]
     if not plot_cols:
         return go.Figure()
@@ -131,13 +154,12 @@ def create_margin_plots(df, ticker: str):
     colors = ['royalblue', 'darkorange', 'green', 'gray']
     return create_subplot_figure(df_ticker, plot_cols, ma, subplot_titles, "%", "Margins Overview - " + ticker, rows, colors)
 
-def create_bank_plots(df, ticker: str):
-    df_temp = df.copy()
-    df_ticker = df_temp[df_temp.TICKER == ticker]
+def create_bank_plots(df, ticker: str, start_year=None):
+    df_ticker = df.get(ticker, since=start_year)
     plot_cols = [col for col in ['PPOP', 'Provision for credit losses', 'COF from loan' , 'Loan yield', 'NIM', 'NPL (3-5)'] if col in df_ticker.columns]
-    for col in ['NIM','Loan yield', 'NPL (3-5)','COF from loan']:
-        if col in df_ticker.columns:
-            df_ticker[col] = df_ticker[col] * 100
+    # New columns rather than writes into the shared index frame
+    df_ticker = df_ticker.assign(**{col: df_ticker[col] * 100 for col in ['NIM','Loan yield', 'NPL (3-5)','COF from loan']
+                                    if col in df_ticker.columns})
     if not plot_cols:
         return go.Figure()
     ma = df_ticker[plot_cols].rolling(window=4, min_periods=1).mean()
@@ -146,69 +168,44 @@ def create_bank_plots(df, ticker: str):
     colors = ['royalblue', 'darkorange', 'green', 'gray']
     return create_subplot_figure(df_ticker.set_index('DATE'), plot_cols, ma, subplot_titles, "", "Bank Supplement Overview - " + ticker, rows, colors)
 
-# Plot P/E and P/B with dotted line for average and +1 and -1 standard deviation
-def create_pe_pb_plot(df, ticker):
-    df_temp = df.copy()
-    df_ticker = df_temp[df_temp['TICKER'] == ticker]
-    pe_data = df_ticker.pivot(index='TRADE_DATE', columns='TICKER', values='P/E')
-    pe_data = pe_data.ffill()  # Forward fill to handle missing values
-    pb_data = df_ticker.pivot(index='TRADE_DATE', columns='TICKER', values='P/B')
-    pb_data = pb_data.ffill()  # Forward fill to handle missing values
-    ps_data = df_ticker.pivot(index='TRADE_DATE', columns='TICKER', values='P/S')
-    ps_data = ps_data.ffill()  # Forward fill to handle missing values
-
-    # Calculate mean and standard deviation
-    pe_mean = pe_data[ticker].mean()
-    pe_std = pe_data[ticker].std()
-    pb_mean = pb_data[ticker].mean()
-    pb_std = pb_data[ticker].std()
-    ps_mean = ps_data[ticker].mean()
-    ps_std = ps_data[ticker].std()
-
-    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.05,
-                        subplot_titles=(f"{ticker} P/E Ratio", f"{ticker} P/B Ratio", f"{ticker} P/S Ratio"))
-
-    #fig P/E
-    fig.add_trace(go.Scatter(x=pe_data.index, y=pe_data[ticker], mode='lines', name='P/E', line=dict(color='green')),
-                  row=1, col=1)
-    fig.add_hline(y=pe_mean, line_dash="dash", line_color="red", row=1, col=1, line_width=1)
-    fig.add_hline(y=pe_mean + pe_std, line_dash="dash", line_color="grey", row=1, col=1, line_width=1)
-    fig.add_hline(y=pe_mean - pe_std, line_dash="dash", line_color="grey", row=1, col=1, line_width=1)
-    fig.add_hline(y=pe_mean + 2* pe_std, line_dash="dash", line_color="blue", row=1, col=1, line_width=1)
-    fig.add_hline(y=pe_mean - 2* pe_std, line_dash="dash", line_color="blue", row=1, col=1, line_width=1)
-    
-    # fig P/B
-    fig.add_trace(go.Scatter(x=pb_data.index, y=pb_data[ticker], mode='lines', name='P/B', line=dict(color='green')),
-                  row=2, col=1)
-    fig.add_hline(y=pb_mean, line_dash="dash", line_color="red", row=2, col=1, line_width=1)
-    fig.add_hline(y=pb_mean + pb_std, line_dash="dash", line_color="grey", row=2, col=1, line_width=1)
-    fig.add_hline(y=pb_mean - pb_std, line_dash="dash", line_color="grey", row=2, col=1, line_width=1)
-    fig.add_hline(y=pb_mean + 2 * pb_std, line_dash="dash", line_color="blue", row=2, col=1, line_width=1)
-    fig.add_hline(y=pb_mean - 2 * pb_std, line_dash="dash", line_color="blue", row=2, col=1, line_width=1)
-
-    # fig P/S
-    fig.add_trace(go.Scatter(x=ps_data.index, y=ps_data[ticker], mode='lines', name='P/S', line=dict(color='green')),
-                  row=3, col=1) 
-    fig.add_hline(y=ps_mean, line_dash="dash", line_color="red", row=3, col=1, line_width=1)
-    fig.add_hline(y=ps_mean + ps_std, line_dash="dash", line_color="grey", row=3, col=1, line_width=1)
-    fig.add_hline(y=ps_mean - ps_std, line_dash="dash", line_color="grey", row=3, col=1, line_width=1)
-    fig.add_hline(y=ps_mean + 2 * ps_std, line_dash="dash", line_color="blue", row=3, col=1, line_width=1)
-    fig.add_hline(y=ps_mean - 2 * ps_std, line_dash="dash", line_color="blue", row=3, col=1, line_width=1)
-
-    fig.update_layout(height=1200)
-    return fig
+# Plot P/E, P/B and P/S with dotted lines for the mean and +-1/+-2 standard deviations
+VALUATION_PANELS = ['P/E', 'P/B', 'P/S']
+BAND_LINES = [(0, 'red'), (1, 'grey'), (2, 'blue')]
+
+def _band_trace(x, upper, lower, color, refs, trace_type):
+    # Upper and lower band lines as one trace, split by a gap
+    return dict(type=trace_type, x=np.concatenate([x, x[-1:], x]), y=np.concatenate([upper, [np.nan], lower]),
+                mode='lines', line=dict(color=color, dash='dash', width=1), hoverinfo='skip', **refs)
+
+def create_pe_pb_plot(stats, ticker, window=None):
+    layout = grid_template(3, 1, tuple(f"{ticker} {m} Ratio" for m in VALUATION_PANELS), height=1200,
+                           vertical_spacing=0.05, shared_xaxes=True)
+    panels = []
+    for row, metric in enumerate(VALUATION_PANELS, start=1):
+        if metric not in stats.metrics:
+            continue
+        band = stats.bands(ticker, metric, window)
+        # Full-history bands are constant: two points span the panel
+        band_rows = band.iloc[[0, -1]] if window is None and len(band) else band
+        panels.append((metric, axis_refs(row, 1), band, band_rows))
+
+    # Long daily histories render with WebGL; the count covers the band lines as well
+    n_points = sum(len(band) + len(BAND_LINES) * (2 * len(band_rows) + 1) for _, _, band, band_rows in panels)
+    trace_type = scatter_type(n_points)
+    traces = []
+    for metric, refs, band, band_rows in panels:
+        traces.append(dict(type=trace_type, x=band.index.to_numpy(), y=band['value'].to_numpy(), mode='lines',
+                           name=metric, line=dict(color='green'), **refs))
+        x = band_rows.index.to_numpy()
+        mean, std = band_rows['mean'].to_numpy(), band_rows['std'].to_numpy()
+        for k, color in BAND_LINES:
+            traces.append(_band_trace(x, mean + k * std, mean - k * std, color, refs, trace_type))
+    return build_figure(layout, traces)
 
 #%% Extract key data for displays
-def extract_key_data(df1, df2, ticker):
-    val = df1.copy()
-    mcap = df2.copy()
-    key_data = {}
-    for col in ['P/E', 'P/B', 'EV/EBITDA']:
-        vals = val[(val['TICKER'] == ticker)].sort_values('TRADE_DATE', ascending=False)[col]
-        vals = pd.to_numeric(vals, errors='coerce')
-        latest_val = vals[~vals.isna()].iloc[0] if not vals[~vals.isna()].empty else None
-        key_data[col] = latest_val
-    mcap_vals = mcap[mcap['TICKER'] == ticker]['CUR_MKT_CAP']
+def extract_key_data(stats, df2, ticker):
+    key_data = stats.latest(ticker)
+    mcap_vals = df2.get(ticker)['CUR_MKT_CAP']
     key_data['M_CAP'] = mcap_vals.iloc[0] if not mcap_vals.empty else None
     return key_data
 
@@ -217,17 +214,32 @@ st.set_page_config(layout = 'wide', page_title="Company Dashboard")
 
 # Title
 st.title("Company Dashboard")
-latest_date = pd.to_datetime(val['TRADE_DATE'].max())
+latest_date = pd.to_datetime(val.frame['TRADE_DATE'].max())
 formatted_date = latest_date.strftime('%b-%d-%Y') if not pd.isnull(latest_date) else "N/A"
 
 # Side bar for ticker selection and start year selection
 st.sidebar.header('Ticker Selection')
-selected_ticker = st.sidebar.selectbox("Select Ticker", df['TICKER'].unique())
-years = sorted(df['YEAR'].unique()) # Add a year selector
+selected_ticker = st.sidebar.selectbox("Select Ticker", df.tickers)
+years = sorted(df.frame['YEAR'].unique()) # Add a year selector
 start_year = st.sidebar.selectbox("Select Start Year", years, index=4) #defaulted to 2020
 
+# Background price cache warmer (opt-in: set SSI_CACHE_WARMER=1)
+from ssi import start_cache_warmer
+warmer = start_cache_warmer()
+if warmer is not None:
+    warm_status = warmer.status()
+    st.sidebar.caption(
+        f"Price cache: {warm_status['warm']}/{warm_status['total']} tickers warm ({warm_status['warm_pct']:.0f}%), "
+        f"{warm_status['in_memory']} preloaded"
+        + (" - warming..." if warm_status['running'] else "")
+    )
+
+# Slowest recent price-pipeline stages (opt-in: set SSI_TRACE_PANEL=1)
+from ssi.tracing import show_trace_panel
+show_trace_panel()
+
 # Boxes to display most recent P/E, P/B, EV/EBITDA, and market cap level
-key_data = extract_key_data(val,mcap, selected_ticker)
+key_data = extract_key_data(val_stats, mcap, selected_ticker)
 st.subheader("Ticker: " + selected_ticker)
 st.write(f"Data last updated: {formatted_date} (except for price chart - daily updated)")
 
@@ -242,59 +254,83 @@ with col4:
     st.metric("EV/EBITDA", f"{key_data['EV/EBITDA']:,.2f}" if key_data['EV/EBITDA'] is not None else "N/A", border = True)
 # with col5:
 #     # Format the latest TRADE_DATE as 'Mon-Day-Year'
-#     latest_date = pd.to_datetime(val['TRADE_DATE'].max())
+#     latest_date = pd.to_datetime(val.frame['TRADE_DATE'].max())
 #     formatted_date = latest_date.strftime('%b-%d-%Y') if not pd.isnull(latest_date) else "N/A"
 #     st.metric("Last Data", formatted_date, border=True)
 
-# Filter dataframe based on selected start year
-df = df[df['YEAR'] >= start_year]
-bank = bank[bank['YEARREPORT'] >= start_year]
-
-# Add plots below the tables
-fig_FA = create_FA_plots(df, selected_ticker)
-fig_GR = create_gr_plots(df, selected_ticker)
-fig_MARGIN = create_margin_plots(df, selected_ticker)
-fig_BANK_SUPPLEMENT = create_bank_plots(bank, selected_ticker)
-
-# Plot OHLCV data
+# Sections below are fragments: a widget inside one reruns only that section, and
+# collapsed expanders / hidden tabs (on_change="rerun") skip their work until opened.
+# The sidebar ticker and start year still rerun the whole page.
 from ssi import load_ticker_price
+from ssi.chart import DEFAULT_INDICATORS
+from ssi.indicators import INDICATOR_PRESETS
+from ssi.resample import RESOLUTIONS
+from ssi.tracing import span
 ytd = datetime(datetime.today().year, 1, 1)
 
-with st.expander("Price Chart", expanded=True):
-    start_date_price = st.date_input("Start Date (Default: YTD)", value=ytd, key ="start_date_price")
-    fig_PRICE = load_ticker_price(selected_ticker, start_date=start_date_price.strftime('%Y-%m-%d'))
-    st.plotly_chart(fig_PRICE)
-
-# Tab for 3 financial graphs
-with st.expander("Financial Graphs", expanded=True):
-    tab1, tab2, tab3, tab4 = st.tabs(["IS", "Supplement(Bank)", "Growth", "Margin"])
-    with tab1:
-        st.plotly_chart(fig_FA)
-    with tab2:
-        st.plotly_chart(fig_BANK_SUPPLEMENT)
-    with tab3:
-        st.plotly_chart(fig_GR)
-    with tab4:
-        st.plotly_chart(fig_MARGIN)
+# Plot OHLCV data
+@st.fragment
+def price_section(ticker):
+    with st.expander("Price Chart", expanded=True):
+        start_date_price = st.date_input("Start Date (Default: YTD)", value=ytd, key ="start_date_price")
+        resolution_price = st.radio("Resolution", list(RESOLUTIONS), format_func=RESOLUTIONS.get,
+                                    horizontal=True, key="resolution_price")
+        selected_indicators = st.multiselect("Indicators", INDICATOR_PRESETS, default=list(DEFAULT_INDICATORS),
+                                             key="indicators_price")
+        with span("render.price_chart", ticker=ticker):
+            fig_PRICE = load_ticker_price(ticker, start_date=start_date_price.strftime('%Y-%m-%d'),
+                                          resolution=resolution_price, indicators=tuple(selected_indicators))
+            with span("render.plotly_chart", ticker=ticker):  # Serialization and send
+                st.plotly_chart(fig_PRICE)
+
+# Tab for financial graphs (rows from the selected start year); only the selected tab is built
+@st.fragment
+def financial_graphs_section(ticker, start_year):
+    graphs = {
+        "IS": lambda: create_FA_plots(fa_cube, ticker, start_year),
+        "Supplement(Bank)": lambda: create_bank_plots(bank, ticker, start_year),
+        "Growth": lambda: create_gr_plots(fa_cube, ticker, start_year),
+        "Margin": lambda: create_margin_plots(fa_cube, ticker, start_year),
+    }
+    with st.expander("Financial Graphs", expanded=True, key="expander_graphs", on_change="rerun") as expander:
+        if not expander.open:
+            return
+        for tab, create_fig in zip(st.tabs(list(graphs), key="tabs_graphs", on_change="rerun"), graphs.values()):
+            if tab.open:
+                with tab:
+                    st.plotly_chart(create_fig())
 
 # Valuation Plots
-fig_val = create_pe_pb_plot(val, selected_ticker)
-with st.expander("Valuation Charts", expanded=False):
-    st.plotly_chart(fig_val, key="pe_chart")
-
-# Financial Tables:
-fs_table_result = create_fs_table_main(df, selected_ticker)
-bs_table_result = process_section(df[df['TICKER'] == selected_ticker], BS, 'BS')
-cf_table_result = process_section(df[df['TICKER'] == selected_ticker], CF, 'CF')
-
-with st.expander("Financial Tables", expanded=False):
-    tab1, tab2, tab3 = st.tabs(["Financial Summary", "Balance Sheet", "Cash Flow"])
-    with tab1:
-        st.subheader("Financial Summary Table (IS, Growth, Margin)")
-        st.dataframe(fs_table_result)
-    with tab2:
-        st.subheader("Balance Sheet Table")
-        st.dataframe(bs_table_result)
-    with tab3:
-        st.subheader("Cash Flow Table")
-        st.dataframe(cf_table_result)
+@st.fragment
+def valuation_section(ticker):
+    with st.expander("Valuation Charts", expanded=False, key="expander_valuation", on_change="rerun") as expander:
+        if not expander.open:
+            return
+        window = st.radio("Bands", [None, *val_stats.windows], horizontal=True, key="valuation_window",
+                          format_func=lambda w: "Full history" if w is None else f"{w} rolling")
+        st.plotly_chart(create_pe_pb_plot(val_stats, ticker, window), key="pe_chart")
+        show_table(val_stats.summary(ticker), fmt="%,.2f")
+
+# Financial Tables
+@st.fragment
+def financial_tables_section(ticker, start_year):
+    tables = {
+        "Financial Summary": ("Financial Summary Table (IS, Growth, Margin)",
+                              lambda: create_fs_table_main(fa_cube, ticker, start_year)),
+        "Balance Sheet": ("Balance Sheet Table", lambda: process_section(fa_cube, ticker, BS, 'BS', start_year=start_year)),
+        "Cash Flow": ("Cash Flow Table", lambda: process_section(fa_cube, ticker, CF, 'CF', start_year=start_year)),
+    }
+    with st.expander("Financial Tables", expanded=False, key="expander_tables", on_change="rerun") as expander:
+        if not expander.open:
+            return
+        for tab, (subheader, create_table) in zip(st.tabs(list(tables), key="tabs_tables", on_change="rerun"),
+                                                  tables.values()):
+            if tab.open:
+                with tab:
+                    st.subheader(subheader)
+                    show_table(create_table(), units=FS_UNITS)
+
+price_section(selected_ticker)
+financial_graphs_section(selected_ticker, start_year)
+valuation_section(selected_ticker)
+financial_tables_section(selected_ticker, start_year)
@@ -0,0 +1,137 @@
+"""
+Fetch-layer benchmark against the local TCBS stand-in
+
+Measures throughput and p50/p95/p99 latency of fetch_historical_price,
+get_ticker_data and load_ticker_price at several concurrency levels, and
+how many requests reach the upstream. Runs fully offline.
+
+Usage:
+    python -m benchmarks.bench_fetch --concurrency 1 4 16 --requests 200 --latency-ms 50
+    python -m benchmarks.bench_fetch --targets fetch_historical_price --no-store   # Network path only
+    python -m benchmarks.bench_fetch --url http://127.0.0.1:8765   # Out-of-process mock
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.mock_tcbs import start_mock_server
+
+
+TARGETS = ['fetch_historical_price', 'get_ticker_data', 'load_ticker_price']
+
+# --no-store only reaches fetch_historical_price; the loader targets always use the store
+STORE_STATE = {False: 'on', True: 'off for fetch_historical_price'}
+
+
+def percentiles(samples: list) -> dict:
+    values = np.asarray(samples) * 1e3
+    return {f"p{q}": float(np.percentile(values, q)) for q in (50, 95, 99)}
+
+
+def reset_state(store_dir: str) -> None:
+    """
+    Start each run cold: empty price store, new client and no cached results
+    """
+    import ssi.client
+    import ssi.loader
+    import ssi.store
+
+    fd, path = tempfile.mkstemp(suffix='.sqlite', dir=store_dir)
+    os.close(fd)
+    ssi.store._store = ssi.store.PriceStore(path)
+    ssi.client._client = None
+    ssi.loader.load_history.clear()
+
+
+def run(target: str, concurrency: int, n_requests: int, tickers: list, start_date: str, use_store: bool) -> dict:
+    """
+    Issue n_requests calls of target from `concurrency` threads
+
+    Returns:
+        dict: Throughput, latency percentiles, errors and upstream requests
+    """
+    import ssi.fetch
+    import ssi.loader
+
+    if target == 'fetch_historical_price':
+        call = lambda ticker: ssi.fetch.fetch_historical_price(ticker, start_date, use_store=use_store)
+    else:
+        call = lambda ticker: getattr(ssi.loader, target)(ticker, start_date)
+
+    def timed(i):
+        start = time.perf_counter()
+        result = call(tickers[i % len(tickers)])
+        return time.perf_counter() - start, result is None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, range(n_requests)))
+    wall = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in results]
+    return {
+        'throughput': n_requests / wall,
+        **percentiles(latencies),
+        'errors': sum(failed for _, failed in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--targets', nargs='+', default=TARGETS, choices=TARGETS)
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--tickers', type=int, default=20, help="Distinct tickers cycled through")
+    parser.add_argument('--start-date', default='2015-01-01')
+    parser.add_argument('--no-store', action='store_true', help="Bypass the on-disk price store for fetch_historical_price "
+                             "(the loader targets always read through the store)")
+    parser.add_argument('--url', help="Use an already running mock server instead of an in-process one")
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-bars', type=int, default=None)
+    parser.add_argument('--extra-fields', type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = args.url
+        print(f"Mock TCBS at {url}, store {STORE_STATE[args.no_store]}")
+    else:
+        server = start_mock_server(
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+            max_bars=args.max_bars, extra_fields=args.extra_fields
+        )
+        url = server.url
+        print(f"Mock TCBS at {url} (latency {args.latency_ms}±{args.jitter_ms} ms, "
+              f"error rate {args.error_rate:.0%}), store {STORE_STATE[args.no_store]}")
+    # Point the client at the mock before ssi reads its configuration
+    os.environ['TCBS_BASE_URL'] = url
+    os.environ.setdefault('TCBS_RATE_LIMIT', '1000')
+
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+    header = f"{'target':<24}{'conc':>5}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'upstream':>10}"
+    print(header)
+    print('-' * len(header))
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        for target in args.targets:
+            for concurrency in args.concurrency:
+                reset_state(store_dir)
+                served_before = server.requests_served if server else 0
+                stats = run(target, concurrency, args.requests, tickers, args.start_date, not args.no_store)
+                upstream = server.requests_served - served_before if server else '-'
+                print(f"{target:<24}{concurrency:>5}{stats['throughput']:>10.1f}{stats['p50']:>10.2f}"
+                      f"{stats['p95']:>10.2f}{stats['p99']:>10.2f}{stats['errors']:>8}{upstream:>10}")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
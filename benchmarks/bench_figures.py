@@ -0,0 +1,184 @@
+"""
+Figure-build benchmark per chart type
+
+Compares the original make_subplots + update passes construction with the
+prebuilt templates of ssi.chart and utils.figures, on synthetic data shaped
+like the dashboard's charts. Both candlestick variants share the indicator
+and decimation code, so the difference is figure construction.
+
+Usage:
+    python -m benchmarks.bench_figures [--years 10] [--repeat 30]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from benchmarks.mock_tcbs import synthetic_bars
+from ssi.chart import DEFAULT_INDICATORS, INDICATOR_COLORS, _indicator_name, create_ohlcv_candlestick
+from ssi.decimate import MAX_BARS, decimate_line, decimate_ohlcv
+from ssi.indicators import OVERLAYS, canonical_spec, get_indicators, parse_indicator
+from ssi.parse import parse_bars
+from utils.figures import axis_refs, build_figure, grid_template
+
+
+# Candlestick -----------------------------------------------------------------
+
+def candlestick_legacy(df: pd.DataFrame, symbol: str, start_date: str, indicators: tuple) -> go.Figure:
+    # The pre-template construction of ssi.chart.create_ohlcv_candlestick
+    df_full = df.copy()
+    df_full['tradingDate'] = pd.to_datetime(df_full['tradingDate'], errors='coerce')
+    df_full = df_full.dropna(subset=['tradingDate']).reset_index(drop=True)
+    indicators = list(indicators)
+    df_ind = get_indicators(df_full, indicators, key=(symbol, 'D'), start_date=start_date)
+    df_temp = df_full[df_full['tradingDate'] >= start_date]
+    df_bars, step = decimate_ohlcv(df_temp, MAX_BARS)
+
+    oscillators = [spec for spec in indicators if parse_indicator(spec)[0] not in OVERLAYS]
+    rows = 2 + len(oscillators)
+    row_heights = [0.7, 0.3] if not oscillators else [0.55, 0.15] + [0.3 / len(oscillators)] * len(oscillators)
+    fig = make_subplots(rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=row_heights,
+                        subplot_titles=[f"{symbol} Price Chart", "Volume"] + [canonical_spec(s) for s in oscillators])
+    fig.add_trace(go.Candlestick(x=df_bars['tradingDate'], open=df_bars['open'], high=df_bars['high'],
+                                 low=df_bars['low'], close=df_bars['close'], name='OHLC', opacity=0.8,
+                                 increasing_line_color='#26A69A', decreasing_line_color='#EF5350'), row=1, col=1)
+    for idx, spec in enumerate(indicators):
+        name, _ = parse_indicator(spec)
+        label = canonical_spec(spec)
+        color = INDICATOR_COLORS[idx % len(INDICATOR_COLORS)]
+        row = 1 if name in OVERLAYS else 3 + oscillators.index(spec)
+        columns = [f"{label} upper", f"{label} lower"] if name == 'BB' else []
+        columns += [f"{label} hist", f"{label} signal"] if name == 'MACD' else []
+        for column in columns + [label]:
+            x, y = decimate_line(df_ind['tradingDate'], df_ind[column], MAX_BARS)
+            fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=_indicator_name(spec) if column == label else column,
+                                     line=dict(color=color, width=2 if row == 1 else 1.5), opacity=0.8),
+                          row=row, col=1)
+        if name == 'RSI':
+            for level in (30, 70):
+                fig.add_hline(y=level, line_dash="dash", line_color="grey", line_width=1, row=row, col=1)
+    colors = ['#26A69A' if c >= o else '#EF5350' for c, o in zip(df_bars['close'], df_bars['open'])]
+    fig.add_trace(go.Bar(x=df_bars['tradingDate'], y=df_bars['volume'] / 1_000_000, marker_color=colors,
+                         name='Volume', opacity=0.6), row=2, col=1)
+    fig.update_layout(template='plotly_white', title=dict(text=f"{symbol} Price Chart", x=0.5, xanchor='center',
+                                                          font=dict(size=20, color='#2E3440')),
+                      xaxis_rangeslider_visible=False, autosize=True, height=600 + 180 * len(oscillators),
+                      showlegend=True, legend=dict(orientation="h", x=1, y=1.05, xanchor="center", yanchor="top",
+                                                   bgcolor='rgba(255,255,255,0)', borderwidth=0),
+                      margin=dict(l=50, r=50, t=80, b=50), plot_bgcolor='white', paper_bgcolor='white')
+    fig.update_xaxes(showgrid=False, type='date', tickformat='%b %Y', tickangle=0, tickfont=dict(size=10))
+    fig.update_yaxes(row=1, col=1, showgrid=True, gridcolor='rgba(0,0,0,0.01)', zeroline=False, tickformat=',.0f')
+    fig.update_yaxes(row=2, col=1, showgrid=True, gridcolor='rgba(0,0,0,0.01)', zeroline=False,
+                     tickformat='.2f', ticksuffix='M')
+    for axis in fig.layout:
+        if axis.startswith("xaxis"):
+            fig.layout[axis].update(showgrid=False)
+    return fig
+
+
+# Fundamentals grid (Company_Dashboard.create_subplot_figure) ---------------------
+
+def fs_grid_legacy(df_ticker, plot_cols, ma, subplot_titles, yaxis_suffix, title, rows, colors):
+    fig = make_subplots(rows=rows, cols=2, subplot_titles=subplot_titles)
+    for idx, col in enumerate(plot_cols):
+        row = idx // 2 + 1
+        col_pos = idx % 2 + 1
+        color = colors[idx % len(colors)]
+        fig.add_trace(go.Bar(x=df_ticker.index, y=df_ticker[col], name=col, marker_color=color), row=row, col=col_pos)
+        fig.add_trace(go.Scatter(x=df_ticker.index, y=ma[col], mode='lines', name=f'{col} MA(4)',
+                                 line=dict(color='red')), row=row, col=col_pos)
+    fig.update_layout(title_text=title, showlegend=False, height=400 * rows, width=1200, template="plotly_white")
+    fig.update_yaxes(ticksuffix=yaxis_suffix)
+    return fig
+
+
+def fs_grid_template(df_ticker, plot_cols, ma, subplot_titles, yaxis_suffix, title, rows, colors):
+    # Same as Company_Dashboard.create_subplot_figure (the page module runs the app on import)
+    layout = grid_template(rows, 2, tuple(subplot_titles), height=400 * rows, width=1200,
+                           yaxis_suffix=yaxis_suffix, template="plotly_white")
+    x = df_ticker.index.to_numpy()
+    traces = []
+    for idx, col in enumerate(plot_cols):
+        refs = axis_refs(idx // 2 + 1, idx % 2 + 1, cols=2)
+        traces.append(dict(type='bar', x=x, y=df_ticker[col].to_numpy(), name=col,
+                           marker=dict(color=colors[idx % len(colors)]), **refs))
+        traces.append(dict(type='scatter', x=x, y=ma[col].to_numpy(), mode='lines', name=f'{col} MA(4)',
+                           line=dict(color='red'), **refs))
+    return build_figure(layout, traces, title=dict(text=title))
+
+
+# Bank metrics grid (pages/Bank_Dashboard.plot) -----------------------------------
+
+def bank_grid_legacy(df):
+    row = df.shape[0] // 2 + 1
+    fig = make_subplots(rows=row, cols=2, subplot_titles=df.index.tolist(), vertical_spacing=0.05)
+    for i, metric in enumerate(df.index):
+        row = i // 2 + 1
+        fig.add_trace(go.Bar(x=df.columns, y=df.loc[metric], name=metric), row=row, col=i % 2 + 1)
+    fig.update_layout(height=400 * row, width=1200, title_text="Asset Quality Metrics", showlegend=False)
+    return fig
+
+
+def bank_grid_template(df):
+    # Same as pages/Bank_Dashboard.plot
+    n = df.shape[0]
+    layout = grid_template(n // 2 + 1, 2, tuple(df.index), height=400 * ((n - 1) // 2 + 1), width=1200,
+                           vertical_spacing=0.05)
+    x = df.columns.to_numpy()
+    values = df.to_numpy()
+    traces = [dict(type='bar', x=x, y=values[i], name=metric, **axis_refs(i // 2 + 1, i % 2 + 1, cols=2))
+              for i, metric in enumerate(df.index)]
+    return build_figure(layout, traces, title=dict(text="Asset Quality Metrics"))
+
+
+def timeit(fn, *args, repeat: int) -> float:
+    fn(*args)  # Warm-up (fills templates and indicator memo)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    end = pd.Timestamp.today()
+    df = parse_bars(synthetic_bars('SYN', int((end - pd.DateOffset(years=args.years)).timestamp()), int(end.timestamp())))
+    start_date = df['tradingDate'].iloc[0].strftime('%Y-%m-%d')
+    all_indicators = ('SMA(20)', 'SMA(50)', 'BB(20,2)', 'RSI(14)', 'MACD(12,26,9)')
+
+    rng = np.random.default_rng(0)
+    periods = [f"{y}Q{q}" for y in range(2015, 2025) for q in range(1, 5)]
+    fs = pd.DataFrame(rng.normal(100, 20, (len(periods), 4)), index=periods,
+                      columns=['Net_Revenue', 'Gross_Profit', 'EBIT', 'NPATMI'])
+    fs_args = (fs, list(fs.columns), fs.rolling(4, min_periods=1).mean(), [c.replace('_', ' ') for c in fs.columns],
+               "bn", "Income Statement Overview - SYN", 2, ['royalblue', 'darkorange', 'green', 'gray'])
+    bank = pd.DataFrame(rng.normal(1, 0.3, (10, 27)), index=[f"Metric {i}" for i in range(10)],
+                        columns=[f"B{i:02d}" for i in range(27)])
+
+    cases = [
+        (f"candlestick ({len(df)} bars)", candlestick_legacy, create_ohlcv_candlestick,
+         (df, 'SYN', start_date, DEFAULT_INDICATORS)),
+        ("candlestick + oscillators", candlestick_legacy, create_ohlcv_candlestick,
+         (df, 'SYN', start_date, all_indicators)),
+        ("fundamentals 2x2 grid", fs_grid_legacy, fs_grid_template, fs_args),
+        ("bank metrics 5x2 grid", bank_grid_legacy, bank_grid_template, (bank,)),
+    ]
+    print(f"{'chart':<30}{'legacy ms':>12}{'template ms':>14}{'speed-up':>10}")
+    for label, legacy_fn, template_fn, fn_args in cases:
+        legacy = timeit(legacy_fn, *fn_args, repeat=args.repeat)
+        template = timeit(template_fn, *fn_args, repeat=args.repeat)
+        print(f"{label:<30}{legacy * 1e3:>12.2f}{template * 1e3:>14.2f}{legacy / template:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark for TCBS bar payload parsing
+
+Compares the original list-of-dicts DataFrame path with ssi.parse on a
+synthetic 20-year daily payload.
+
+Usage:
+    python -m benchmarks.bench_parse [--years 20] [--repeat 50]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from ssi.parse import loads, orjson, parse_bars
+
+
+def make_payload(years: int = 20, seed: int = 0) -> bytes:
+    """
+    Build a synthetic bars-long-term response body with ISO tradingDates
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    close = 20_000 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    open_ = close * (1 + rng.normal(0, 0.01, len(dates)))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, len(dates)))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, len(dates)))
+    volume = rng.integers(100_000, 10_000_000, len(dates))
+    bars = [
+        {
+            'open': round(float(o), 1), 'high': round(float(h), 1), 'low': round(float(l), 1),
+            'close': round(float(c), 1), 'volume': int(v),
+            'tradingDate': d.strftime('%Y-%m-%dT00:00:00.000Z'),
+        }
+        for d, o, h, l, c, v in zip(dates, open_, high, low, close, volume)
+    ]
+    return json.dumps({'ticker': 'SYN', 'data': bars}).encode()
+
+
+def parse_legacy(content: bytes) -> pd.DataFrame:
+    # The pre-ssi.parse implementation of fetch_historical_price
+    data = json.loads(content)
+    df = pd.DataFrame(data['data'])
+    if not pd.api.types.is_numeric_dtype(df['tradingDate']) and df['tradingDate'].str.contains('T').any():
+        df['tradingDate'] = pd.to_datetime(df['tradingDate'])
+    else:
+        df['tradingDate'] = pd.to_datetime(df['tradingDate'], unit='ms')
+    columns_to_keep = ['tradingDate', 'open', 'high', 'low', 'close', 'volume']
+    df = df[[col for col in columns_to_keep if col in df.columns]]
+    return df.sort_values('tradingDate')
+
+
+def parse_fast(content: bytes) -> pd.DataFrame:
+    return parse_bars(loads(content)['data'])
+
+
+def timeit(fn, arg, repeat: int) -> float:
+    fn(arg)  # Warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    content = make_payload(args.years)
+    n_bars = args.years * 252
+    print(f"Payload: {n_bars} bars, {len(content) / 1e6:.2f} MB, decoder: {'orjson' if orjson else 'json'}")
+
+    legacy = timeit(parse_legacy, content, args.repeat)
+    fast = timeit(parse_fast, content, args.repeat)
+    print(f"{'legacy':<8} {legacy * 1e3:8.2f} ms")
+    print(f"{'fast':<8} {fast * 1e3:8.2f} ms   ({legacy / fast:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Local stand-in for the TCBS bars-long-term endpoint
+
+Serves deterministic synthetic OHLCV for any ticker and range, with
+configurable latency, error rate and payload size, so the fetch path can be
+measured and regression-tested offline.
+
+Usage:
+    python -m benchmarks.mock_tcbs --port 8765 --latency-ms 80 --error-rate 0.05
+    TCBS_BASE_URL=http://127.0.0.1:8765 streamlit run Company_Dashboard.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+
+BARS_PATH = "/stock-insight/v1/stock/bars-long-term"
+
+
+def synthetic_bars(ticker: str, from_ts: int, to_ts: int, max_bars: int = None, extra_fields: int = 0) -> list:
+    """
+    Generate daily bars for a ticker between two timestamps.
+    Prices follow a random walk seeded by the ticker, so the same bar is
+    identical across requests and ranges.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        from_ts (int): Range start (seconds)
+        to_ts (int): Range end (seconds)
+        max_bars (int): Keep only the most recent max_bars bars
+        extra_fields (int): Padding fields added to each bar to inflate the payload
+
+    Returns:
+        list: Bar records in the TCBS response format
+    """
+    dates, bars = _ticker_history(ticker, pd.Timestamp(to_ts, unit='s').strftime('%Y-%m-%d'))
+    first = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(from_ts, unit='s').normalize(), 'D')))
+    if max_bars:
+        first = max(first, len(bars) - max_bars)
+
+    if not extra_fields:
+        return bars[first:]
+    padding = {f"field{i}": 0.0 for i in range(extra_fields)}
+    return [{**bar, **padding} for bar in bars[first:]]
+
+
+@lru_cache(maxsize=256)
+def _ticker_history(ticker: str, end_date: str) -> tuple:
+    # Full random-walk history per ticker, generated once and sliced per request
+    dates = pd.bdate_range('2000-01-03', end_date)
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    close = 10_000 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, len(dates))))
+    open_ = close * (1 + rng.normal(0, 0.01, len(dates)))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, len(dates)))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, len(dates)))
+    volume = rng.integers(10_000, 5_000_000, len(dates))
+
+    bars = [
+        {
+            'open': round(float(o), 1), 'high': round(float(h), 1), 'low': round(float(l), 1),
+            'close': round(float(c), 1), 'volume': int(v),
+            'tradingDate': d.strftime('%Y-%m-%dT00:00:00.000Z'),
+        }
+        for d, o, h, l, c, v in zip(dates, open_, high, low, close, volume)
+    ]
+    return dates.values.astype('datetime64[D]'), bars
+
+
+class MockTCBSServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering bars-long-term requests.
+
+    Attributes:
+        latency_ms (float): Mean added latency per request
+        jitter_ms (float): Uniform +/- jitter around latency_ms
+        error_rate (float): Probability of answering 503
+        max_bars (int): Cap on bars per response
+        extra_fields (int): Padding fields per bar
+        requests_served (int): Requests answered so far, errors included
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, max_bars: int = None, extra_fields: int = 0):
+        super().__init__(address, _Handler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.max_bars = max_bars
+        self.extra_fields = extra_fields
+        self.requests_served = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._count_lock:
+            self.requests_served += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+    def do_GET(self):
+        server = self.server
+        server.count_request()
+        delay = server.latency_ms + random.uniform(-server.jitter_ms, server.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        url = urlparse(self.path)
+        if url.path != BARS_PATH:
+            return self._send(404, {'message': 'Not found'})
+        if random.random() < server.error_rate:
+            return self._send(503, {'message': 'Service unavailable'})
+
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            ticker = query['ticker'].upper()
+            from_ts = int(query['from'])
+            to_ts = int(query.get('to', time.time()))
+        except (KeyError, ValueError):
+            return self._send(400, {'message': 'Bad request'})
+
+        bars = synthetic_bars(ticker, from_ts, to_ts, server.max_bars, server.extra_fields)
+        self._send(200, {'ticker': ticker, 'data': bars})
+
+    def _send(self, status: int, body: dict) -> None:
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(port: int = 0, **config) -> MockTCBSServer:
+    """
+    Start a mock server on a background thread
+
+    Args:
+        port (int): Port to listen on (0 picks a free port)
+        **config: MockTCBSServer options (latency_ms, error_rate, ...)
+
+    Returns:
+        MockTCBSServer: Running server; call shutdown() to stop it
+    """
+    server = MockTCBSServer(("127.0.0.1", port), **config)
+    threading.Thread(target=server.serve_forever, name="mock-tcbs", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-bars', type=int, default=None)
+    parser.add_argument('--extra-fields', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockTCBSServer(
+        ("127.0.0.1", args.port), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, max_bars=args.max_bars, extra_fields=args.extra_fields
+    )
+    print(f"Mock TCBS listening on {server.url}{BARS_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,26 @@
 #%%
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from utils.utils import get_data_path
+from utils.bank_store import display_factors, load_bank_store, period_label
+from utils.bank_query import METRIC_BLOCKS, BankQuery
+from utils.bank_rank import RANK_MEASURES, RANK_SCOPES, PeerRanking
+from utils.bank_aggregate import PeerAggregator
+from utils.datastore import dataset_version
+from utils.tables import show_heat_table, show_table
+from utils.figures import axis_refs, build_figure, grid_template, scatter_type
 
 #%% Load bank data
-@st.cache_data
-def load_bank_data():
-    bank = pd.read_csv(get_data_path("df_q_full.csv"))
-    bank_formatted = pd.read_csv(get_data_path("df_q_full_formatted.csv"))
-    bank['DATE'] = bank['YEARREPORT'].astype(str) + 'Q' + bank['LENGTHREPORT'].astype(str)
-    bank_formatted['DATE'] = bank_formatted['YEARREPORT'].astype(str) + 'Q' + bank_formatted['LENGTHREPORT'].astype(str)
-    return bank, bank_formatted
+# Derived caches are keyed by the CSV version, so they rebuild when the data is refreshed
+BANK_FILE = "df_q_full.csv"
+
+@st.cache_resource(max_entries=2)
+def load_bank_data(version):
+    # One typed numeric frame shared by all sessions (read-only); display scaling comes from the
+    # keycode mapping's Format column
+    return load_bank_store(BANK_FILE)
 
 @st.cache_data
 def load_mapping_and_classification():
@@ -23,6 +31,7 @@ def load_mapping_and_classification():
 
     ca_format = mapping[mapping['KeyCode'].str.startswith('CA.')][['KeyCode','Format']]
     ca_pct = ca_format[ca_format['Format'] == 'pct']['KeyCode'].tolist()
+    factors = display_factors(mapping)
 
     keycode_to_name_dict = mapping.set_index('KeyCode')['Name'].to_dict()
     keycode_to_name_dict.pop("Dividend") # Remove Dividend as it is not used in the dashboard
@@ -32,211 +41,86 @@ def load_mapping_and_classification():
     classification = pd.read_excel(get_data_path("Classification.xlsx"))
     classification['GROUP'] = classification['GROUP'].astype(str)
     
-    return ca_pct, keycode_to_name_dict, name_to_keycode_dict, classification
+    return ca_pct, factors, keycode_to_name_dict, name_to_keycode_dict, classification
+
+@st.cache_resource(max_entries=2)
+def load_bank_query(version):
+    # Store indexed by (ticker, period) once per process; block tables are slices of it
+    _, factors, keycode_to_name_dict, _, _ = load_mapping_and_classification()
+    return BankQuery(load_bank_data(version), names=keycode_to_name_dict, factors=factors)
+
+@st.cache_resource(max_entries=2)
+def load_peer_ranking(version):
+    # Rank / percentile / z-score of every bank, period and CA/IS keycode, within group and system-wide
+    _, _, keycode_to_name_dict, _, classification = load_mapping_and_classification()
+    return PeerRanking(load_bank_data(version), classification, names=keycode_to_name_dict)
+
+@st.cache_resource(max_entries=2)
+def load_peer_aggregator(version):
+    # Dense per-bank arrays of the classified banks; aggregates are sums over the selected banks
+    ca_pct, _, _, _, classification = load_mapping_and_classification()
+    return PeerAggregator(load_bank_data(version), ca_pct, tickers=classification['TICKER'])
 
 # Load cached data
-bank, bank_formatted = load_bank_data()
-ca_pct, keycode_to_name_dict, name_to_keycode_dict, classification = load_mapping_and_classification()
-
-#%% Functions for single bank data table
-def single_ticker(df, ticker):
-    """
-    Extract data for a single ticker in quarterly format
-    """
-    df_ticker = df[df['TICKER'] == ticker].copy()
-    return df_ticker
-
-def single_income_statement(df, startperiod=2022):
-    """
-    IS.3 - Net Interest Income
-    IS.1 - Interest Income
-    IS.2 - Interest Expense
-    IS.6 - Net Fees Income
-    IS.14 - Total Operating Income
-    IS.15 - G&A Expense
-    IS.16 - PPOP
-    IS.17 - Provisions for credit losses
-    IS.18 - PBT
-    IS.24 - NPATMI
-    """
-    cols = ['DATE', 'IS.3', 'IS.1', 'IS.2', 'IS.6', 'IS.14', 'IS.15', 'IS.16', 'IS.17', 'IS.18', 'IS.24']
-    df_is = df[df['YEARREPORT'] >= startperiod][cols].copy()
-
-    df_melted = df_is.melt(id_vars='DATE', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot(index='Metric', columns='DATE', values='Value')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)
-    return df_pivoted
-
-def single_size(df, startperiod = 2022):
-    """
-    BS.1 - Total Assets
-    CA.16 - Total Credit
-    BS.13 - Total Loans
-    Nt.97 - Total Government Bonds
-    BS.56 - Total Deposits
-    BS.65 - Total Equity
-    """
-    cols = ['DATE', 'BS.1','CA.16','BS.13','Nt.97','BS.56','BS.65']
-    df_size = df[df['YEARREPORT'] >= startperiod][cols].copy()
-
-    df_melted = df_size.melt(id_vars='DATE', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot(index='Metric', columns='DATE', values='Value')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)    
-    return df_pivoted
-
-def single_earnings_quality(df, startperiod = 2022):
-    """
-    CA.25 - Average Asset Yield
-    CA.35 - Average Loan Yield
-    CA.38 - Average Bond Yield
-    CA.41 - Average Deposit Yield
-    CA.26 - Average Funding Cost
-    CA.44 - Cost of Funding from Deposit
-    CA.47 - Cost of Funding from Loan
-    CA.49 - Cost of Funding from Valuable Paper
-    CA.27 - NIM
-    CA.28 - Provision to PPOP
-    CA.14 - CIR    
-    """
-    cols = ['DATE', 'CA.25', 'CA.35', 'CA.38', 'CA.41', 'CA.26', 'CA.44', 'CA.47', 'CA.49', 'CA.27', 'CA.28', 'CA.14']
-    df_eq = df[df['YEARREPORT'] >= startperiod][cols].copy()
+bank_version = dataset_version(BANK_FILE)
+bank = load_bank_data(bank_version)
+ca_pct, DISPLAY_FACTORS, keycode_to_name_dict, name_to_keycode_dict, classification = load_mapping_and_classification()
+bank_query = load_bank_query(bank_version)
+peer_ranking = load_peer_ranking(bank_version)
+peer_aggregator = load_peer_aggregator(bank_version)
 
-    df_melted = df_eq.melt(id_vars='DATE', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot(index='Metric', columns='DATE', values='Value')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)
-    return df_pivoted
-
-def single_asset_quality(df, startperiod = 2022):
-    """
-    CA.5 - NPL %
-    CA.13 - NPL Formation %
-    CA.6 - Group 5 %
-    CA.10 - G2 Formation %
-    CA.15 - LLR
-    """
-    cols = ['DATE', 'CA.5', 'CA.13', 'CA.6', 'CA.10', 'CA.15']
-    df_asset_quality = df[df['YEARREPORT'] >= startperiod][cols].copy()
-
-    df_melted = df_asset_quality.melt(id_vars='DATE', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot(index='Metric', columns='DATE', values='Value')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)
-    
-    return df_pivoted
+# Percent rows carry their unit in the row label
+PCT_UNITS = {keycode_to_name_dict.get(k, k): '%' for k in ca_pct}
 
+#%% Block tables and plots
 def plot(df):
-    df_temp = df.copy()
-    row = df_temp.shape[0] // 2 + 1
-    fig = make_subplots(rows=row, cols=2, subplot_titles=df_temp.index.tolist(), vertical_spacing=0.05)
-
-    for i, metric in enumerate(df_temp.index):
-        row = i // 2 + 1
-        col = i % 2 + 1
-        fig.add_trace(go.Bar(x=df_temp.columns, y=df_temp.loc[metric], name=metric), row=row, col=col)
-
-    fig.update_layout(
-        height=400 * row, width=1200, 
-        title_text="Asset Quality Metrics", 
-        showlegend=False,
-        # template='simple_white',
-    )
-    return fig
-
-#%% Functions for multiple banks data table
-def income_statement_multi(df, tickers, period = '2025Q1'):
-    """
-    IS.3 - Net Interest Income
-    IS.1 - Interest Income
-    IS.2 - Interest Expense
-    IS.6 - Net Fees Income
-    IS.14 - Total Operating Income
-    IS.15 - G&A Expense
-    IS.16 - PPOP
-    IS.17 - Provisions for credit losses
-    IS.18 - PBT
-    IS.24 - NPATMI
-    """
-    cols = ['TICKER', 'IS.3', 'IS.1', 'IS.2', 'IS.6', 'IS.14', 'IS.15', 'IS.16', 'IS.17', 'IS.18', 'IS.24']
-    df_is = df[(df['DATE'] == period) & (df['TICKER'].isin(tickers))][cols].copy()
-
-    df_melted = df_is.melt(id_vars='TICKER', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot_table(index='Metric', columns='TICKER', values='Value', aggfunc='first')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)
-    
-    return df_pivoted
-
-def size_multi(df, tickers, period = '2025Q1'):
+    n = df.shape[0]
+    layout = grid_template(n // 2 + 1, 2, tuple(df.index), height=400 * ((n - 1) // 2 + 1), width=1200,
+                           vertical_spacing=0.05)
+    x = df.columns.to_numpy()
+    values = df.to_numpy()
+    traces = [
+        dict(type='bar', x=x, y=values[i], name=metric, **axis_refs(i // 2 + 1, i % 2 + 1, cols=2))
+        for i, metric in enumerate(df.index)
+    ]
+    return build_figure(layout, traces, title=dict(text="Asset Quality Metrics"))
+
+#%% Peer ranking heat-table
+def show_ranking(key, ticker=None, tickers=None, period=None, start_year=None):
     """
-    BS.1 - Total Assets
-    CA.16 - Total Credit
-    BS.13 - Total Loans
-    Nt.97 - Total Government Bonds
-    BS.56 - Total Deposits
-    BS.65 - Total Equity
+    Ranking controls and heat-table for one bank over time (ticker) or a set of banks at one period
     """
-    cols = ['TICKER','BS.1','CA.16','BS.13','Nt.97','BS.56','BS.65']
-    df_size = df[(df['DATE'] == period) & (df['TICKER'].isin(tickers))][cols].copy()
-
-    df_melted = df_size.melt(id_vars='TICKER', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot(index='Metric', columns='TICKER', values='Value')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)
-    return df_pivoted
-
-def earnings_quality_multi(df, tickers , period = '2025Q1'):
-    """
-    CA.25 - Average Asset Yield
-    CA.35 - Average Loan Yield
-    CA.38 - Average Bond Yield
-    CA.41 - Average Deposit Yield
-    CA.26 - Average Funding Cost
-    CA.44 - Cost of Funding from Deposit
-    CA.47 - Cost of Funding from Loan
-    CA.49 - Cost of Funding from Valuable Paper
-    CA.27 - NIM
-    CA.28 - Provision to PPOP
-    CA.14 - CIR    
-    """
-    cols = ['TICKER', 'CA.25', 'CA.35', 'CA.38', 'CA.41', 'CA.26', 'CA.44', 'CA.47', 'CA.49', 'CA.27', 'CA.28', 'CA.14']
-    df_eq = df[(df['DATE'] == period) & (df['TICKER'].isin(tickers))][cols].copy()
-        
-    df_melted = df_eq.melt(id_vars='TICKER', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot(index='Metric', columns='TICKER', values='Value')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)
-    
-    return df_pivoted 
-
-def asset_quality_multi(df, tickers, period = '2025Q1'):
-    """
-    CA.5 - NPL %
-    CA.13 - NPL Formation %
-    CA.6 - Group 5 %
-    CA.10 - G2 Formation %
-    CA.15 - LLR
-    """
-    cols = ['TICKER', 'CA.5', 'CA.13', 'CA.6', 'CA.10', 'CA.15']
-    df_asset_quality = df[(df['DATE'] == period) & (df['TICKER'].isin(tickers))][cols].copy()
-
-    df_melted = df_asset_quality.melt(id_vars='TICKER', var_name='Metric', value_name='Value')
-    df_pivoted = df_melted.pivot(index='Metric', columns='TICKER', values='Value')
-    df_pivoted = df_pivoted.reindex(index=cols[1:])
-    df_pivoted = df_pivoted.rename(index=keycode_to_name_dict)
-
-    return df_pivoted
+    col1, col2, col3 = st.columns(3)
+    block = col1.selectbox("Block", [title for title, _ in METRIC_BLOCKS.values()], key=f"{key}_block")
+    scope = col2.radio("Peers", list(RANK_SCOPES), format_func=RANK_SCOPES.get, horizontal=True, key=f"{key}_scope")
+    measure = col3.radio("Measure", list(RANK_MEASURES), format_func=RANK_MEASURES.get, horizontal=True,
+                         key=f"{key}_measure")
+    keycodes = next(codes for title, codes in METRIC_BLOCKS.values() if title == block)
+    keycodes = [k for k in keycodes if k in peer_ranking.keycodes]
+
+    if ticker is not None:
+        table = peer_ranking.single(ticker, keycodes, scope, measure, start_year=start_year)
+    else:
+        table = peer_ranking.multi(tickers, period, keycodes, scope, measure)
+    if table.empty or not keycodes:
+        st.info("Ranking covers classified banks and CA/IS keycodes only.")
+        return
+    if measure == 'rank':
+        size = peer_ranking.scope_size(scope, ticker if ticker is not None else next(iter(tickers), None))
+        show_heat_table(table, 1, size, fmt="{:.0f}", reverse=True)
+    elif measure == 'pct':
+        show_heat_table(table, 0, 100, fmt="{:.0f}")
+    else:
+        show_heat_table(table, -2, 2, fmt="{:.2f}")
 
 #%% Free plotting function
-def visualize_multi_ticker_data(df, tickers, keycodes, startperiod=2021):
+def visualize_multi_ticker_data(query, tickers, keycodes, startperiod=2021):
     """
     Visualize data for multiple tickers over time on the same chart.
     keycodes: list of keycodes to plot, each in its own subplot.
     If one keycode, use 1 column; else use 2 columns per row.
     """
-    if not keycodes or not tickers:
+    if len(keycodes) == 0 or len(tickers) == 0:
         return go.Figure()  # Return empty figure if nothing selected
 
     if isinstance(keycodes, str):
@@ -250,60 +134,47 @@ def visualize_multi_ticker_data(df, tickers, keycodes, startperiod=2021):
     palette = plotly.colors.qualitative.Plotly
     ticker_colors = {ticker: palette[i % len(palette)] for i, ticker in enumerate(tickers)}
 
-    fig = make_subplots(
-        rows=nrows, cols=ncols, shared_xaxes=True,
-        subplot_titles=[keycode_to_name_dict.get(k, k) for k in keycodes],
-        vertical_spacing=0.07
-    )
-    for idx, keycode in enumerate(keycodes):
-        row = idx // ncols + 1
-        col = idx % ncols + 1
-        for t_idx, ticker in enumerate(tickers):
-            df_ticker = df[(df['TICKER'] == ticker) & (df['YEARREPORT'] >= startperiod)].copy()
-            df_ticker = df_ticker.sort_values(['YEARREPORT', 'LENGTHREPORT'])
-            if keycode in ca_pct:
-                df_ticker[keycode] = df_ticker[keycode] * 100
-            if keycode in df_ticker.columns and not df_ticker.empty:
-                # Only show legend for first subplot
-                showlegend = (idx == 0)
-                fig.add_trace(
-                    go.Scatter(
-                        x=df_ticker['DATE'],
-                        y=pd.to_numeric(df_ticker[keycode], errors='coerce'),
-                        name=ticker,
-                        mode='lines+markers',
-                        marker=dict(color=ticker_colors[ticker]),
-                        line=dict(color=ticker_colors[ticker]),
-                        showlegend=showlegend,
-                    ),
-                    row=row, col=col
-                )
-    fig.update_layout(
-        title="Multi Ticker Data",
-        width=1200,
-        height=500 * nrows,
-        template="plotly_white",
-        barmode='group',
-        xaxis_showgrid=False,
-        showlegend=True
-    )
-    # Set y-axis titles for each subplot
+    # Period x (keycode, ticker) matrix; ratio keycodes scaled to percent column-wise,
+    # then transposed so each trace reads one contiguous row
+    history = query.history(tickers, keycodes, start_year=startperiod)
+    values = history.to_numpy(dtype=np.float64, copy=True)
+    values[:, history.columns.get_level_values('KEYCODE').isin(ca_pct)] *= 100
+    series = np.ascontiguousarray(values.T)
+    x = history.index.to_numpy()
+    has_data = ~np.isnan(series).all(axis=1)
+
+    # Switch to WebGL once the figure gets dense
+    trace_type = scatter_type(int(has_data.sum()) * len(x))
+
+    layout = grid_template(nrows, ncols, tuple(keycode_to_name_dict.get(k, k) for k in keycodes), height=500 * nrows,
+                           width=1200, vertical_spacing=0.07, template="plotly_white", shared_xaxes=True)
+    panel = {keycode: idx for idx, keycode in enumerate(keycodes)}
+    traces = []
+    for (keycode, ticker), y, filled in zip(history.columns, series, has_data):
+        if not filled:
+            continue
+        idx = panel[keycode]
+        traces.append(dict(
+            type=trace_type, x=x, y=y, name=ticker, mode='lines+markers', connectgaps=True,
+            marker=dict(color=ticker_colors[ticker]), line=dict(color=ticker_colors[ticker]),
+            showlegend=(idx == 0),  # Only show legend for first subplot
+            **axis_refs(idx // ncols + 1, idx % ncols + 1, cols=ncols),
+        ))
+
+    # Set y-axis titles and tick formats for each subplot
+    axes = {}
     for idx, keycode in enumerate(keycodes):
-        row = idx // ncols + 1
-        col = idx % ncols + 1
-        fig.update_yaxes(title_text=keycode_to_name_dict.get(keycode, keycode), row=row, col=col)
-        if keycode in ca_pct:
-            fig.update_yaxes(ticksuffix="%", tickformat=".2f", row=row, col=col)
-        else:
-            fig.update_yaxes(tickformat="~s", row=row, col=col)
-    return fig
+        yaxis = axis_refs(idx // ncols + 1, idx % ncols + 1, cols=ncols)['yaxis'].replace('y', 'yaxis')
+        ticks = dict(ticksuffix="%", tickformat=".2f") if keycode in ca_pct else dict(tickformat="~s")
+        axes[yaxis] = {**layout[yaxis], 'title': dict(text=keycode_to_name_dict.get(keycode, keycode)), **ticks}
+    axes['xaxis'] = {**layout['xaxis'], 'showgrid': False}
+    return build_figure(layout, traces, title=dict(text="Multi Ticker Data"), showlegend=True, **axes)
 
 #%% Streamlit App Design
 st.set_page_config(layout = 'wide', page_title="Banking Dashboard")
 
 st.title("Banking Dashboard")
-latest_date = str(bank['PERIOD_INDEX'].max())
-formatted = f"{latest_date[:4]}Q{latest_date[-1]}"
+formatted = period_label(int(bank['PERIOD'].max()))
 st.write(f"Data last updated: {formatted}")
 
 # Selection for single bank analysis
@@ -317,78 +188,42 @@ selected_start = st.sidebar.selectbox("Select Start Period", list_periods, index
 st.sidebar.header('Multi-Bank Selection')
 selected_group = st.sidebar.selectbox("Select Group", sorted(classification['GROUP'].unique()))
 selected_tickers = classification[classification['GROUP'] == selected_group]['TICKER'].unique()
-selected_period = st.sidebar.selectbox("Select Period", sorted(bank['DATE'].unique(), reverse=True), index=0)
-
-# Single-bank tables
-IS = single_income_statement(single_ticker(bank_formatted, selected_ticker), startperiod=selected_start)
-SIZE = single_size(single_ticker(bank_formatted, selected_ticker), startperiod=selected_start)
-EARNINGS_QUALITY = single_earnings_quality(single_ticker(bank_formatted, selected_ticker), startperiod=selected_start)
-ASSET_QUALITY = single_asset_quality(single_ticker(bank_formatted, selected_ticker), startperiod=selected_start)
-
-# Multi-bank tables
-IS_MULTI = income_statement_multi(bank_formatted, tickers=selected_tickers, period=selected_period)
-SIZE_MULTI = size_multi(bank_formatted, tickers=selected_tickers, period=selected_period)
-EARNINGS_QUALITY_MULTI = earnings_quality_multi(bank_formatted, tickers=selected_tickers, period=selected_period)
-ASSET_QUALITY_MULTI = asset_quality_multi(bank_formatted, tickers=selected_tickers, period=selected_period)
-
-# Plots
-IS_PLOT = plot(IS)
-ASSET_QUALITY_PLOT = plot(ASSET_QUALITY)
-EARNINGS_QUALITY_PLOT = plot(EARNINGS_QUALITY)
-SIZE_PLOT = plot(SIZE)
-
-# Multi-bank plot
-IS_MULTI_PLOT = plot(IS_MULTI)
-EARNINGS_QUALITY_MULTI_PLOT = plot(EARNINGS_QUALITY_MULTI)
-ASSET_QUALITY_MULTI_PLOT = plot(ASSET_QUALITY_MULTI)
-SIZE_MULTI_PLOT = plot(SIZE_MULTI)
+selected_period = st.sidebar.selectbox("Select Period", sorted(bank['PERIOD'].unique(), reverse=True), index=0,
+                                       format_func=period_label)
+
+# User-defined block shown as an extra tab in both views
+custom_names = st.sidebar.multiselect("Custom Block", options=sorted(name_to_keycode_dict), key='custom_block')
+blocks = {title: keycodes for title, keycodes in METRIC_BLOCKS.values()}
+if custom_names:
+    blocks["Custom"] = [name_to_keycode_dict[m] for m in custom_names]
 
 # Display tabs
-tab11, tab21, tab31 = st.tabs(["Single Bank", "Multi-Bank",'Charting'])
+tab11, tab21, tab31, tab41 = st.tabs(["Single Bank", "Multi-Bank",'Charting', "Custom Peers"])
 
 with tab11:
     st.subheader(f"Single Bank: {selected_ticker}")
-    tab1, tab2, tab3, tab4 = st.tabs(["Income Statement", "Sizes", "Earnings Quality", "Asset Quality"])
-    with tab1:
-        st.dataframe(IS)
-        st.plotly_chart(IS_PLOT)
-    with tab2:
-        st.dataframe(SIZE)
-        st.plotly_chart(SIZE_PLOT)
-    with tab3:
-        st.dataframe(EARNINGS_QUALITY)
-        st.plotly_chart(EARNINGS_QUALITY_PLOT)
-    with tab4:
-        st.dataframe(ASSET_QUALITY)
-        st.plotly_chart(ASSET_QUALITY_PLOT)
+    tabs = st.tabs([*blocks, "Peer Ranking"])
+    for tab, (title, keycodes) in zip(tabs, blocks.items()):
+        with tab:
+            table = bank_query.single(selected_ticker, keycodes, start_year=selected_start)
+            show_table(table, units=PCT_UNITS, fmt='%,.2f')
+            st.plotly_chart(plot(table))
+    with tabs[-1]:
+        show_ranking("rank_single", ticker=selected_ticker, start_year=selected_start)
 
 with tab21:
     st.subheader(f"Multi-Bank for Group {selected_group}")
-    tab1, tab2, tab3, tab4 = st.tabs(["Income Statement", "Sizes", "Earnings Quality", "Asset Quality"])
-    with tab1:
-        if IS_MULTI.empty:
-            st.warning("No data available for selected tickers and period.")
-        else:
-            st.dataframe(IS_MULTI)
-            st.plotly_chart(IS_MULTI_PLOT)
-    with tab2:
-        if SIZE_MULTI.empty:
-            st.warning("No data available for selected tickers and period.")
-        else:
-            st.dataframe(SIZE_MULTI)
-            st.plotly_chart(SIZE_MULTI_PLOT)
-    with tab3:
-        if EARNINGS_QUALITY_MULTI.empty:
-            st.warning("No data available for selected tickers and period.")
-        else:
-            st.dataframe(EARNINGS_QUALITY_MULTI)
-            st.plotly_chart(EARNINGS_QUALITY_MULTI_PLOT)
-    with tab4:
-        if ASSET_QUALITY_MULTI.empty:
-            st.warning("No data available for selected tickers and period.")
-        else:
-            st.dataframe(ASSET_QUALITY_MULTI)
-            st.plotly_chart(ASSET_QUALITY_MULTI_PLOT)
+    tabs = st.tabs([*blocks, "Peer Ranking"])
+    for tab, (title, keycodes) in zip(tabs, blocks.items()):
+        with tab:
+            table = bank_query.multi(selected_tickers, selected_period, keycodes)
+            if table.empty:
+                st.warning("No data available for selected tickers and period.")
+            else:
+                show_table(table, units=PCT_UNITS, fmt='%,.2f')
+                st.plotly_chart(plot(table))
+    with tabs[-1]:
+        show_ranking("rank_multi", tickers=selected_tickers, period=selected_period)
 
 
 list = list(name_to_keycode_dict.keys())
@@ -396,14 +231,32 @@ list = list(name_to_keycode_dict.keys())
 with tab31:
     st.subheader("Charting for multi tickers")
     st.write('You can also select SOCB, Industry, 1, 2, 3 to view')
-    chart_tickers = st.multiselect("Select Ticker", bank_formatted['TICKER'].unique(), key='chart_ticker')
+    chart_tickers = st.multiselect("Select Ticker", bank['TICKER'].unique(), key='chart_ticker')
     selected_meanings = st.multiselect("Select KeyCode", options=list)
-    starting_period = st.selectbox('Select Starting Period', options=(bank_formatted['YEARREPORT'].unique()), index=4)
+    starting_period = st.selectbox('Select Starting Period', options=(bank['YEARREPORT'].unique()), index=4)
     selected_keycodes = [name_to_keycode_dict[m] for m in selected_meanings]
     CHART = visualize_multi_ticker_data(
-        bank,
+        bank_query,
         tickers=chart_tickers,
         keycodes=selected_keycodes,
         startperiod=starting_period
     )
     st.plotly_chart(CHART)
+
+with tab41:
+    st.subheader("Custom peer group")
+    st.write('Amounts are summed across the selected banks; ratios are recomputed from the summed components')
+    peer_tickers = st.multiselect("Select Banks", peer_aggregator.tickers.tolist(), key='peer_group')
+    if not peer_tickers:
+        st.info("Select banks to aggregate.")
+    else:
+        peer_rows = peer_aggregator.aggregate(peer_tickers, name='CUSTOM', start_year=selected_start)
+        peer_query = BankQuery(peer_rows, names=keycode_to_name_dict, factors=DISPLAY_FACTORS)
+        partial = peer_rows.loc[peer_rows['N_BANKS'] < len(peer_tickers), 'DATE'].tolist()
+        if partial:
+            st.caption(f"Periods without data for every selected bank: {', '.join(partial)}")
+        for tab, (title, keycodes) in zip(st.tabs([*blocks]), blocks.items()):
+            with tab:
+                table = peer_query.single('CUSTOM', keycodes)
+                show_table(table, units=PCT_UNITS, fmt='%,.2f')
+                st.plotly_chart(plot(table))
@@ -16,8 +16,8 @@ __all__ = [
 
 # Try to import fetch functions if requests is available
 try:
-    from .fetch import fetch_historical_price, validate_ticker
-    __all__.extend(['fetch_historical_price', 'validate_ticker'])
+    from .fetch import fetch_historical_price, fetch_many, validate_ticker
+    __all__.extend(['fetch_historical_price', 'fetch_many', 'validate_ticker'])
 except ImportError:
     # Requests not available, fetch functions won't be exposed
     pass
@@ -25,7 +25,9 @@ except ImportError:
 # Try to import loader functions if streamlit is available
 try:
     from .loader import load_ticker_price, get_ticker_data, get_available_tickers
-    __all__.extend(['load_ticker_price', 'get_ticker_data', 'get_available_tickers'])
+    from .warmer import start_cache_warmer, get_ticker_universe
+    __all__.extend(['load_ticker_price', 'get_ticker_data', 'get_available_tickers',
+                    'start_cache_warmer', 'get_ticker_universe'])
 except ImportError:
     # Streamlit not available, loader functions won't be exposed
     pass 
\ No newline at end of file
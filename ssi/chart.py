@@ -3,136 +3,77 @@ SSI Chart Creation Module
 Handles creating beautiful candlestick charts with technical indicators
 """
 
+import copy
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit as st
 
+from .decimate import MAX_BARS, decimate_line, decimate_ohlcv
+from .indicators import OVERLAYS, canonical_spec, get_indicators, parse_indicator
+from .render import scatter_type
+from .resample import period_start
+from .tracing import span
 
-def calculate_moving_averages(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Calculate 20-day and 50-day moving averages
-    
-    Args:
-        df (pd.DataFrame): DataFrame with OHLCV data
-        
-    Returns:
-        pd.DataFrame: DataFrame with added MA columns
-    """
-    df = df.copy()
-    
-    # Calculate moving averages
-    df['MA20'] = df['close'].rolling(window=20, min_periods=1).mean()
-    df['MA50'] = df['close'].rolling(window=50, min_periods=1).mean()
-    
-    return df
+
+DEFAULT_INDICATORS = ('SMA(20)', 'SMA(50)')
+
+# Line colors for indicators, in selection order (MA(20) orange, MA(50) blue)
+INDICATOR_COLORS = ['#FF9800', '#2196F3', '#9C27B0', '#795548', '#009688', '#E91E63', '#607D8B']
 
 
-def create_ohlcv_candlestick(df: pd.DataFrame, symbol: str, start_date: str = '2024-01-01') -> go.Figure:
+def _indicator_name(spec: str) -> str:
+    # Keep the familiar MA(n) legend labels for simple moving averages
+    name, params = parse_indicator(spec)
+    return f"MA({params[0]})" if name == 'SMA' else canonical_spec(spec)
+
+
+@lru_cache(maxsize=64)
+def _candlestick_template(oscillators: tuple) -> dict:
     """
-    Create a beautiful candlestick chart with volume and moving averages
+    Styled layout of a candlestick chart, built once per oscillator set.
+    Only the title texts change between charts; they are filled in by
+    create_ohlcv_candlestick.
     
     Args:
-        df (pd.DataFrame): DataFrame with OHLCV data
-        symbol (str): Stock symbol for title
-        start_date (str): Start date for filtering data
+        oscillators (tuple): Canonical specs of the oscillator panels, in order
         
     Returns:
-        go.Figure: Plotly figure object
+        dict: Layout (read-only)
     """
-    
-    if df is None or df.empty:
-        st.error("No data available to create chart")
-        return go.Figure()
-    
-    # Filter data by start date
-    df_temp = df[df['tradingDate'] >= start_date].copy()
-    
-    if df_temp.empty:
-        st.warning(f"No data available from {start_date}")
-        return go.Figure()
-    
-    # Calculate moving averages
-    df_temp = calculate_moving_averages(df_temp)
-    
-    # Ensure datetime type for time axis - ép kiểu rõ ràng
-    df_temp['tradingDate'] = pd.to_datetime(df_temp['tradingDate'], errors='coerce')
-    # Remove any invalid dates
-    df_temp = df_temp.dropna(subset=['tradingDate'])
+    # Price and volume panels, plus one panel per oscillator
+    rows = 2 + len(oscillators)
+    row_heights = [0.7, 0.3] if not oscillators else [0.55, 0.15] + [0.3 / len(oscillators)] * len(oscillators)
     
     # Create subplot with price and volume
     fig = make_subplots(
-        rows=2, cols=1, 
+        rows=rows, cols=1, 
         shared_xaxes=True, 
         vertical_spacing=0.03,
-        row_heights=[0.7, 0.3],
-        subplot_titles=[f"{symbol} Price Chart", "Volume"]
-    )
-
-    # Candlestick chart
-    fig.add_trace(
-        go.Candlestick(
-            x=df_temp['tradingDate'],
-            open=df_temp['open'],
-            high=df_temp['high'],
-            low=df_temp['low'],
-            close=df_temp['close'],
-            name='OHLC',
-            opacity=0.8,
-            increasing_line_color='#26A69A',
-            decreasing_line_color='#EF5350'
-        ), row=1, col=1
+        row_heights=row_heights,
+        subplot_titles=["Price Chart", "Volume"] + list(oscillators)
     )
     
-    # Moving Average 20
-    fig.add_trace(
-        go.Scatter(
-            x=df_temp['tradingDate'],
-            y=df_temp['MA20'],
-            mode='lines',
-            name='MA(20)',
-            line=dict(color='#FF9800', width=2),
-            opacity=0.8
-        ), row=1, col=1
-    )
-    
-    # Moving Average 50
-    fig.add_trace(
-        go.Scatter(
-            x=df_temp['tradingDate'],
-            y=df_temp['MA50'],
-            mode='lines',
-            name='MA(50)',
-            line=dict(color='#2196F3', width=2),
-            opacity=0.8
-        ), row=1, col=1
-    )
-    
-    # Volume bars with color coding (convert to millions)
-    colors = ['#26A69A' if c >= o else '#EF5350' for c, o in zip(df_temp['close'], df_temp['open'])]
-    volume_m = df_temp['volume'] / 1_000_000  # Convert to millions
-    fig.add_trace(
-        go.Bar(
-            x=df_temp['tradingDate'],
-            y=volume_m,
-            marker_color=colors,
-            name='Volume',
-            opacity=0.6
-        ), row=2, col=1
-    )
+    for idx, spec in enumerate(oscillators):
+        if parse_indicator(spec)[0] == 'RSI':
+            for level in (30, 70):
+                fig.add_hline(y=level, line_dash="dash", line_color="grey", line_width=1, row=3 + idx, col=1,
+                              exclude_empty_subplots=False)
     
     # Update layout for better appearance
     fig.update_layout(
         template='plotly_white',
         title=dict(
-            text=f"{symbol} Price Chart",
             x=0.5,
             xanchor='center',
             font=dict(size=20, color='#2E3440')
         ),
         xaxis_rangeslider_visible=False,
         autosize=True,
-        height=600,
+        height=600 + 180 * len(oscillators),
         showlegend=True,
         # hovermode='x unified',  # Bỏ để tránh xung đột
         legend=dict(
@@ -149,7 +90,7 @@ def create_ohlcv_candlestick(df: pd.DataFrame, symbol: str, start_date: str = '2
         paper_bgcolor='white'
     )
     
-    # X-Axis for both rows (hide vertical grid, show date format) - cách mạnh hơn
+    # X-Axis for all rows (hide vertical grid, show date format)
     fig.update_xaxes(
         showgrid=False,
         type='date',
@@ -176,15 +117,164 @@ def create_ohlcv_candlestick(df: pd.DataFrame, symbol: str, start_date: str = '2
         tickformat='.2f',
         ticksuffix='M'
     )
-
-    # Bỏ fig.update_traces để tránh ghi đè hovertemplate
     
-    # Force hide all vertical grids - cách mạnh hơn
-    for axis in fig.layout:
-        if axis.startswith("xaxis"):
-            fig.layout[axis].update(showgrid=False)
+    return fig.layout.to_plotly_json()
+
+
+def _axes(row: int) -> dict:
+    suffix = '' if row == 1 else str(row)
+    return {'xaxis': f"x{suffix}", 'yaxis': f"y{suffix}"}
 
-    return fig
+
+def create_ohlcv_candlestick(df: pd.DataFrame, symbol: str, start_date: str = '2024-01-01',
+                             resolution: str = 'D', max_bars: int = MAX_BARS,
+                             indicators: tuple = DEFAULT_INDICATORS, render_mode: str = None) -> go.Figure:
+    """
+    Create a beautiful candlestick chart with volume and technical indicators.
+    Indicators are computed over the whole of df (memoized per symbol and data
+    version) and then sliced to start_date, so pass the full history.
+    Above max_bars, candles are aggregated into coarser OHLC buckets and the
+    indicator lines are downsampled with LTTB, keeping the shape of the chart.
+    The styled layout comes from a template cached per oscillator set; only
+    trace arrays are built per call.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with OHLCV data
+        symbol (str): Stock symbol for title
+        start_date (str): Start date for filtering data
+        resolution (str): Bar size of df ('D', 'W', 'M' or 'Q'), shown in the title
+        max_bars (int): Bar budget before decimation (None to disable)
+        indicators (tuple): Indicator specs, e.g. ('SMA(20)', 'RSI(14)'); overlays are
+                            drawn on the price panel, oscillators get their own panel
+        render_mode (str): 'auto', 'svg' or 'webgl' for indicator lines (defaults to
+                           ssi.render.RENDER_MODE; 'auto' uses WebGL for dense charts)
+        
+    Returns:
+        go.Figure: Plotly figure object
+    """
+    
+    if df is None or df.empty:
+        st.error("No data available to create chart")
+        return go.Figure()
+    
+    # Ensure datetime type for time axis - ép kiểu rõ ràng
+    df_full = df.copy()
+    if not pd.api.types.is_datetime64_any_dtype(df_full['tradingDate']):
+        df_full['tradingDate'] = pd.to_datetime(df_full['tradingDate'], errors='coerce')
+    # Remove any invalid dates
+    df_full = df_full.dropna(subset=['tradingDate']).reset_index(drop=True)
+    
+    # Indicators over full history, then slice both to the requested window; a W/M/Q bar is
+    # labelled with its first day, so the window starts with the period containing start_date
+    indicators = list(indicators or [])
+    window_start = period_start(start_date, resolution)
+    with span("chart.indicators", ticker=symbol, bars=len(df_full), indicators=len(indicators)):
+        df_ind = get_indicators(df_full, indicators, key=(symbol, resolution), start_date=window_start)
+    df_temp = df_full[df_full['tradingDate'] >= window_start]
+    
+    if df_temp.empty:
+        st.warning(f"No data available from {start_date}")
+        return go.Figure()
+    
+    # Decimate: coarser OHLC buckets for candles/volume, LTTB for indicator lines
+    with span("chart.decimate", ticker=symbol, bars=len(df_temp)) as decimate_span:
+        df_bars, step = decimate_ohlcv(df_temp, max_bars)
+        decimate_span.set(step=step)
+    bar_size = f"{step}{resolution}" if step > 1 else f"1{resolution}"
+    
+    def line(column):
+        x, y = decimate_line(df_ind['tradingDate'], df_ind[column], max_bars)
+        return x.to_numpy(), y.to_numpy()
+    
+    with span("chart.figure", ticker=symbol, bars=len(df_bars)) as figure_span:
+        oscillators = [spec for spec in indicators if parse_indicator(spec)[0] not in OVERLAYS]
+        layout = _candlestick_template(tuple(canonical_spec(spec) for spec in oscillators))
+        
+        dates = df_bars['tradingDate'].to_numpy()
+        open_ = df_bars['open'].to_numpy()
+        close = df_bars['close'].to_numpy()
+        
+        # Candlestick chart
+        traces = [
+            dict(
+                type='candlestick',
+                x=dates,
+                open=open_,
+                high=df_bars['high'].to_numpy(),
+                low=df_bars['low'].to_numpy(),
+                close=close,
+                name='OHLC',
+                opacity=0.8,
+                increasing=dict(line=dict(color='#26A69A')),
+                decreasing=dict(line=dict(color='#EF5350')),
+                **_axes(1)
+            )
+        ]
+        
+        # Indicators
+        for idx, spec in enumerate(indicators):
+            name, params = parse_indicator(spec)
+            label = canonical_spec(spec)
+            color = INDICATOR_COLORS[idx % len(INDICATOR_COLORS)]
+            row = 1 if name in OVERLAYS else 3 + oscillators.index(spec)
+        
+            if name == 'BB':
+                for band in ('upper', 'lower'):
+                    x, y = line(f"{label} {band}")
+                    traces.append(dict(
+                        type='scatter', x=x, y=y, mode='lines', name=f"{label} {band}",
+                        line=dict(color=color, width=1, dash='dot'),
+                        fillcolor='rgba(158,158,158,0.08)',
+                        opacity=0.8, showlegend=False, **_axes(row)
+                    ))
+                    if band == 'lower':
+                        traces[-1]['fill'] = 'tonexty'
+        
+            if name == 'MACD':
+                x, y = line(f"{label} hist")
+                traces.append(dict(type='bar', x=x, y=y, name=f"{label} hist",
+                                   marker=dict(color='rgba(158,158,158,0.6)'), showlegend=False, **_axes(row)))
+                x, y = line(f"{label} signal")
+                traces.append(dict(type='scatter', x=x, y=y, mode='lines', name=f"{label} signal",
+                                   line=dict(color='#EF5350', width=1.5), showlegend=False, **_axes(row)))
+        
+            x, y = line(label)
+            traces.append(dict(
+                type='scatter',
+                x=x,
+                y=y,
+                mode='lines',
+                name=_indicator_name(spec),
+                line=dict(color=color, width=2 if row == 1 else 1.5),
+                opacity=0.8,
+                **_axes(row)
+            ))
+        
+        # Volume bars with color coding (convert to millions)
+        traces.append(dict(
+            type='bar',
+            x=dates,
+            y=df_bars['volume'].to_numpy() / 1_000_000,  # Convert to millions
+            marker=dict(color=np.where(close >= open_, '#26A69A', '#EF5350')),
+            name='Volume',
+            opacity=0.6,
+            **_axes(2)
+        ))
+        
+        # Dense line sets render with WebGL (candlesticks and bars have no WebGL variant)
+        lines = [trace for trace in traces if trace['type'] == 'scatter']
+        line_type = scatter_type(sum(len(trace['x']) for trace in lines), render_mode)
+        for trace in lines:
+            trace['type'] = line_type
+        
+        # Fill in the titles; everything else is already in the template
+        layout = copy.deepcopy(layout)
+        layout['title']['text'] = f"{symbol} Price Chart ({bar_size} bars)"
+        layout['annotations'][0]['text'] = f"{symbol} Price Chart"
+        
+        # The template was validated once; traces hold plain arrays
+        figure_span.set(traces=len(traces))
+        return go.Figure(data=traces, layout=layout, _validate=False)
 
 
 def create_simple_line_chart(df: pd.DataFrame, symbol: str, start_date: str = '2024-01-01') -> go.Figure:
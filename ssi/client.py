@@ -0,0 +1,202 @@
+"""
+SSI HTTP Client Module
+Shared, pooled HTTP session for TCBS API calls with retry and backoff
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .parse import loads
+
+
+TCBS_BASE_URL = os.environ.get("TCBS_BASE_URL", "https://apipubaws.tcbs.com.vn")
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json"
+}
+
+# (connect, read) timeout per attempt, and overall deadline per request in seconds
+ATTEMPT_TIMEOUT = (3.05, 8)
+REQUEST_DEADLINE = 12
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per second allowed across all threads of the process
+RATE_LIMIT = float(os.environ.get("TCBS_RATE_LIMIT", 10))
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of successful traffic.
+
+    Every success deposits `ratio` tokens and every retry withdraws one, so
+    when the upstream is down retries dry up instead of multiplying load.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every request of a client.
+
+    Callers block in `acquire` until a token is available, so parallel
+    batch fetches stay under `rate` requests per second in total.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: int = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TCBSClient:
+    """
+    Thread-safe TCBS client built on a keep-alive `requests.Session`.
+
+    Connections are pooled per host, failed attempts on 429/5xx and
+    connection errors are retried with capped exponential backoff and full
+    jitter, and every request is bounded by an overall deadline. All
+    attempts, retries included, pass through one global rate limiter.
+    """
+
+    def __init__(self, base_url: str = TCBS_BASE_URL, pool_size: int = 16,
+                 max_retries: int = 3, backoff_base: float = 0.25, backoff_cap: float = 4,
+                 timeout=ATTEMPT_TIMEOUT, deadline: float = REQUEST_DEADLINE,
+                 rate_limit: float = RATE_LIMIT):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retry_budget = RetryBudget()
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def get(self, path: str, params: dict = None) -> requests.Response:
+        """
+        Send a GET request with retries
+
+        Args:
+            path (str): Endpoint path relative to the base URL
+            params (dict): Query parameters
+
+        Returns:
+            requests.Response: Successful response
+
+        Raises:
+            requests.exceptions.RequestException: When all attempts fail or the deadline passes
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"Deadline of {self.deadline}s exceeded for {url}")
+            timeout = (min(self.timeout[0], remaining), min(self.timeout[1], remaining))
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    self.retry_budget.deposit()
+                    return response
+                error = requests.exceptions.HTTPError(
+                    f"{response.status_code} Error for url: {response.url}", response=response
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+
+            sleep = self._backoff(attempt, response)
+            attempt += 1
+            if (attempt > self.max_retries
+                    or time.monotonic() + sleep >= deadline
+                    or not self.retry_budget.withdraw()):
+                raise error
+            time.sleep(sleep)
+
+    def get_json(self, path: str, params: dict = None):
+        """
+        Send a GET request with retries and decode the JSON body
+        (with orjson when it is installed)
+
+        Args:
+            path (str): Endpoint path relative to the base URL
+            params (dict): Query parameters
+
+        Returns:
+            Decoded JSON payload
+        """
+        return loads(self.get(path, params=params).content)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> TCBSClient:
+    """
+    Get the process-wide TCBS client, creating it on first use
+
+    Returns:
+        TCBSClient: Shared client instance
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TCBSClient()
+    return _client
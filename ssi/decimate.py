@@ -0,0 +1,97 @@
+"""
+SSI Decimation Module
+Shape-preserving downsampling of chart series for long date ranges
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .resample import aggregate_ohlcv
+
+
+# Default cap on candles sent to the browser per chart
+MAX_BARS = 1500
+
+
+def decimate_ohlcv(df: pd.DataFrame, max_bars: int = MAX_BARS) -> tuple:
+    """
+    Aggregate bars into fixed-size OHLC buckets so at most max_bars remain
+
+    Args:
+        df (pd.DataFrame): OHLCV data sorted by tradingDate
+        max_bars (int): Bar budget
+
+    Returns:
+        tuple: (DataFrame, bars_per_bucket); bars_per_bucket is 1 when no
+               aggregation was needed
+    """
+    n = len(df)
+    if not max_bars or n <= max_bars:
+        return df, 1
+    step = math.ceil(n / max_bars)
+    return aggregate_ohlcv(df, np.arange(0, n, step)), step
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection.
+    Keeps the first and last points and, for each bucket in between, the
+    point forming the largest triangle with its neighbours, which
+    preserves peaks and troughs of a line.
+
+    Args:
+        x (np.ndarray): Monotonic x values (numeric)
+        y (np.ndarray): y values
+        n_out (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Average point of the bucket after each one (the last bucket runs to the end)
+    nxt = edges[1:]
+    counts = np.diff(np.append(nxt, n))
+    avg_x = np.add.reduceat(x, nxt) / counts
+    avg_y = np.add.reduceat(y, nxt) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[prev] - avg_x[i]) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y[i] - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def decimate_line(x: pd.Series, y: pd.Series, n_out: int = MAX_BARS) -> tuple:
+    """
+    Downsample a line series with LTTB, ignoring missing values
+
+    Args:
+        x (pd.Series): Datetime or numeric x values
+        y (pd.Series): y values
+        n_out (int): Point budget
+
+    Returns:
+        tuple: (x, y) downsampled
+    """
+    valid = y.notna().to_numpy()
+    x, y = x[valid], y[valid]
+    if not n_out or len(x) <= n_out:
+        return x, y
+    x_num = x.to_numpy().astype('datetime64[ns]').astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x.to_numpy()
+    idx = lttb_indices(x_num, y.to_numpy(), n_out)
+    return x.iloc[idx], y.iloc[idx]
@@ -4,75 +4,181 @@ Handles fetching historical stock price data from TCBS API
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from datetime import datetime
 import streamlit as st
 
+from .client import get_client
+from .parse import parse_bars
+from .resample import RESOLUTIONS, resample_ohlcv
+from .singleflight import SingleFlight
+from .store import get_price_store
+from .tracing import span
 
-def fetch_historical_price(ticker: str, start_date: str = None) -> pd.DataFrame:
+
+# TCBS API endpoint for historical data
+BARS_PATH = "/stock-insight/v1/stock/bars-long-term"
+
+# Coalesces identical in-flight bar loads across Streamlit session threads
+_flight = SingleFlight()
+
+
+def _request_bars(ticker: str, from_ts: int, to_ts: int) -> pd.DataFrame:
+    """
+    Request daily bars for a timestamp range from TCBS API
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        from_ts (int): Range start as Unix timestamp (seconds)
+        to_ts (int): Range end as Unix timestamp (seconds)
+        
+    Returns:
+        pd.DataFrame: DataFrame with OHLCV data or None if no bars
+        
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors
+    """
+    params = {
+        "ticker": ticker,
+        "type": "stock",
+        "resolution": "D",  # Daily data
+        "from": str(from_ts),
+        "to": str(to_ts)
+    }
+    
+    with span("fetch.request", ticker=ticker, from_ts=from_ts, to_ts=to_ts) as request_span:
+        data = get_client().get_json(BARS_PATH, params=params)
+        request_span.set(bars=len(data.get('data') or []))
+    
+    if 'data' not in data or not data['data']:
+        return None
+    
+    with span("fetch.parse", ticker=ticker, bars=len(data['data'])):
+        return parse_bars(data['data'])
+
+
+def _sync_store(ticker: str, start_ts: int, end_ts: int) -> pd.DataFrame:
+    """
+    Bring the on-disk store up to date for a ticker and read from it.
+    Only the missing head of the range and bars newer than the last stored
+    tradingDate are requested from the network.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        start_ts (int): Requested range start (seconds)
+        end_ts (int): Requested range end (seconds)
+        
+    Returns:
+        pd.DataFrame: Stored OHLCV data from start_ts onwards
+    """
+    store = get_price_store()
+    
+    with span("store.sync", ticker=ticker):
+        coverage = store.coverage(ticker)
+        
+        if coverage is None:
+            store.write(ticker, _request_bars(ticker, start_ts, end_ts), start_ts)
+        else:
+            first_ts, last_ms, _ = coverage
+            if start_ts < first_ts:
+                # Backfill history older than anything stored so far
+                store.write(ticker, _request_bars(ticker, start_ts, first_ts), start_ts)
+            if not store.is_fresh(ticker):
+                # Re-request from the last stored bar: it may have been an intraday bar
+                delta_from = last_ms // 1000 if last_ms is not None else first_ts
+                store.write(ticker, _request_bars(ticker, delta_from, end_ts), first_ts)
+    
+    with span("store.read", ticker=ticker) as read_span:
+        df = store.read(ticker, start_ts)
+        read_span.set(bars=0 if df is None else len(df))
+    return df
+
+
+def _start_timestamp(start_date: str = None) -> int:
+    """
+    Convert a start date to a Unix timestamp, defaulting to 1 year ago
+    
+    Args:
+        start_date (str): Start date in 'YYYY-MM-DD' format
+        
+    Returns:
+        int: Timestamp in seconds
+        
+    Raises:
+        ValueError: If start_date is not in 'YYYY-MM-DD' format
+    """
+    if start_date:
+        return int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
+    return int((datetime.now() - pd.Timedelta(days=365)).timestamp())
+
+
+def _load_bars_uncoalesced(ticker: str, start_timestamp: int, use_store: bool = True,
+                           resolution: str = 'D') -> pd.DataFrame:
+    end_timestamp = int(datetime.now().timestamp())
+    if use_store:
+        df = _sync_store(ticker, start_timestamp, end_timestamp)
+    else:
+        df = _request_bars(ticker, start_timestamp, end_timestamp)
+    if df is None or df.empty:
+        return None
+    # Coarser bars are derived locally from daily bars, never fetched
+    if resolution == 'D':
+        return df
+    with span("fetch.resample", ticker=ticker, resolution=resolution, bars=len(df)):
+        return resample_ohlcv(df, resolution)
+
+
+def _load_bars(ticker: str, start_timestamp: int, use_store: bool = True, resolution: str = 'D') -> pd.DataFrame:
+    """
+    Load bars from start_timestamp up to now, via the store or directly.
+    Concurrent calls for the same (ticker, resolution, range) share one
+    in-flight fetch instead of each hitting the API.
+    
+    Returns:
+        pd.DataFrame: OHLCV data or None if no bars
+        
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors
+    """
+    key = (ticker, resolution, start_timestamp, use_store)
+    with span("fetch.load", ticker=ticker, resolution=resolution, use_store=use_store) as load_span:
+        df, shared = _flight.do(key, _load_bars_uncoalesced, ticker, start_timestamp, use_store, resolution)
+        load_span.set(shared=shared, bars=0 if df is None else len(df))
+    # Callers own their frame: hand out copies when the result was shared
+    return df.copy() if shared and df is not None else df
+
+
+def fetch_historical_price(ticker: str, start_date: str = None, use_store: bool = True,
+                           resolution: str = 'D') -> pd.DataFrame:
     """
     Fetch stock historical price and volume data from TCBS API
     
     Args:
         ticker (str): Stock ticker symbol (e.g., 'VNINDEX', 'TCB')
         start_date (str): Start date in 'YYYY-MM-DD' format
+        use_store (bool): Serve from the on-disk price store, fetching only missing bars
+        resolution (str): Bar size: 'D', 'W', 'M' or 'Q' (coarser bars are resampled locally)
         
     Returns:
         pd.DataFrame: DataFrame with OHLCV data or None if error
     """
     
-    # TCBS API endpoint for historical data
-    url = "https://apipubaws.tcbs.com.vn/stock-insight/v1/stock/bars-long-term"
+    if resolution not in RESOLUTIONS:
+        st.error(f"Invalid resolution: {resolution}. Please use one of {', '.join(RESOLUTIONS)}.")
+        return None
     
     # Convert start_date string to timestamp if provided
-    if start_date:
-        try:
-            start_timestamp = str(int(datetime.strptime(start_date, "%Y-%m-%d").timestamp()))
-        except ValueError:
-            st.error(f"Invalid date format: {start_date}. Please use YYYY-MM-DD format.")
-            return None
-    else:
-        # Default to 1 year ago if no start_date provided
-        start_timestamp = str(int((datetime.now() - pd.Timedelta(days=365)).timestamp()))
-    
-    # Parameters for stock data
-    params = {
-        "ticker": ticker,
-        "type": "stock",
-        "resolution": "D",  # Daily data
-        "from": start_timestamp,
-        "to": str(int(datetime.now().timestamp()))
-    }
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "application/json"
-    }
+    try:
+        start_timestamp = _start_timestamp(start_date)
+    except ValueError:
+        st.error(f"Invalid date format: {start_date}. Please use YYYY-MM-DD format.")
+        return None
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        df = _load_bars(ticker, start_timestamp, use_store, resolution)
         
-        if 'data' in data and data['data']:
-            # Convert to DataFrame for easier manipulation
-            df = pd.DataFrame(data['data'])
-            
-            # Convert timestamp to datetime
-            if 'tradingDate' in df.columns:
-                # Check if tradingDate is already in ISO format
-                if df['tradingDate'].dtype == 'object' and df['tradingDate'].str.contains('T').any():
-                    df['tradingDate'] = pd.to_datetime(df['tradingDate'])
-                else:
-                    df['tradingDate'] = pd.to_datetime(df['tradingDate'], unit='ms')
-            
-            # Select relevant columns
-            columns_to_keep = ['tradingDate', 'open', 'high', 'low', 'close', 'volume']
-            df = df[[col for col in columns_to_keep if col in df.columns]]
-            
-            # Sort by date
-            df = df.sort_values('tradingDate')
-            
+        if df is not None:
             return df
         else:
             st.warning(f"No data found for ticker: {ticker}")
@@ -89,6 +195,62 @@ def fetch_historical_price(ticker: str, start_date: str = None) -> pd.DataFrame:
         return None
 
 
+def fetch_many(tickers: list, start_date: str = None, max_concurrency: int = 8,
+               use_store: bool = True, as_frame: bool = False, resolution: str = 'D') -> tuple:
+    """
+    Fetch historical price data for many tickers in parallel.
+    Requests share the client's global rate limit, and a failing ticker
+    is reported instead of aborting the batch.
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        start_date (str): Start date in 'YYYY-MM-DD' format
+        max_concurrency (int): Maximum number of tickers fetched at once
+        use_store (bool): Serve from the on-disk price store, fetching only missing bars
+        as_frame (bool): Return one long-format DataFrame with a 'ticker' column
+        resolution (str): Bar size: 'D', 'W', 'M' or 'Q'
+        
+    Returns:
+        tuple: (data, failures) where data is a dict of ticker -> DataFrame
+               (or a long-format DataFrame if as_frame) and failures is a
+               dict of ticker -> error message
+        
+    Raises:
+        ValueError: If start_date is not in 'YYYY-MM-DD' format; checked once,
+                    before any ticker is fetched, as it would fail every ticker
+    """
+    try:
+        start_timestamp = _start_timestamp(start_date)
+    except ValueError:
+        raise ValueError(f"Invalid start_date: {start_date!r}. Please use YYYY-MM-DD format.") from None
+    tickers = list(dict.fromkeys(tickers))  # De-duplicate, keep order
+    
+    data, failures = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="ssi-fetch") as pool:
+        futures = {pool.submit(_load_bars, ticker, start_timestamp, use_store, resolution): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                failures[ticker] = str(e)
+                continue
+            if df is None:
+                failures[ticker] = "No data found"
+            else:
+                data[ticker] = df
+    
+    # Keep the caller's ticker order
+    data = {ticker: data[ticker] for ticker in tickers if ticker in data}
+    
+    if as_frame:
+        frames = [df.assign(ticker=ticker) for ticker, df in data.items()]
+        columns = ['ticker', 'tradingDate', 'open', 'high', 'low', 'close', 'volume']
+        data = pd.concat(frames, ignore_index=True)[columns] if frames else pd.DataFrame(columns=columns)
+    
+    return data, failures
+
+
 def validate_ticker(ticker: str) -> bool:
     """
     Basic validation for ticker symbol
@@ -0,0 +1,194 @@
+"""
+SSI Technical Indicators Module
+Vectorized indicators computed once over full history and memoized per ticker
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# Indicators drawn on the price panel; the others get their own panel
+OVERLAYS = {'SMA', 'EMA', 'BB', 'VWAP'}
+
+DEFAULT_PARAMS = {
+    'SMA': (20,),
+    'EMA': (20,),
+    'RSI': (14,),
+    'MACD': (12, 26, 9),
+    'BB': (20, 2),
+    'ATR': (14,),
+    'VWAP': (20,),
+}
+
+INDICATOR_PRESETS = [
+    'SMA(20)', 'SMA(50)', 'SMA(200)', 'EMA(20)', 'EMA(50)',
+    'BB(20,2)', 'VWAP(20)', 'RSI(14)', 'MACD(12,26,9)', 'ATR(14)',
+]
+
+MEMO_MAX_ENTRIES = 512
+
+_SPEC_PATTERN = re.compile(r"^\s*([A-Za-z]+)\s*(?:\(([^)]*)\))?\s*$")
+
+
+def parse_indicator(spec: str) -> tuple:
+    """
+    Parse an indicator spec such as 'SMA(50)' or 'MACD(12,26,9)'
+
+    Args:
+        spec (str): Indicator name with optional parameters
+
+    Returns:
+        tuple: (name, params) with params as a tuple of numbers
+    """
+    match = _SPEC_PATTERN.match(spec)
+    if not match or match.group(1).upper() not in DEFAULT_PARAMS:
+        raise ValueError(f"Unknown indicator: {spec}. Use one of {', '.join(DEFAULT_PARAMS)}.")
+    name = match.group(1).upper()
+    if not match.group(2):
+        return name, DEFAULT_PARAMS[name]
+    params = tuple(float(p) if '.' in p else int(p) for p in match.group(2).replace(' ', '').split(','))
+    return name, params
+
+
+def canonical_spec(spec: str) -> str:
+    name, params = parse_indicator(spec)
+    return f"{name}({','.join(str(p) for p in params)})"
+
+
+def sma(close: pd.Series, window: int) -> pd.Series:
+    return close.rolling(window=window, min_periods=window).mean()
+
+
+def ema(close: pd.Series, span: int) -> pd.Series:
+    return close.ewm(span=span, adjust=False, min_periods=span).mean()
+
+
+def rsi(close: pd.Series, window: int = 14) -> pd.Series:
+    # Wilder's smoothing
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return pd.DataFrame({'macd': line, 'signal': signal_line, 'hist': line - signal_line})
+
+
+def bollinger(close: pd.Series, window: int = 20, k: float = 2) -> pd.DataFrame:
+    rolling = close.rolling(window=window, min_periods=window)
+    mid = rolling.mean()
+    std = rolling.std(ddof=0)
+    return pd.DataFrame({'mid': mid, 'upper': mid + k * std, 'lower': mid - k * std})
+
+
+def atr(df: pd.DataFrame, window: int = 14) -> pd.Series:
+    prev_close = df['close'].shift()
+    true_range = np.maximum(df['high'] - df['low'],
+                            np.maximum((df['high'] - prev_close).abs(), (df['low'] - prev_close).abs()))
+    return true_range.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+
+
+def vwap(df: pd.DataFrame, window: int = 20) -> pd.Series:
+    # Rolling VWAP on the typical price, so values do not depend on the visible window
+    typical = (df['high'] + df['low'] + df['close']) / 3
+    pv = (typical * df['volume']).rolling(window=window, min_periods=window).sum()
+    return pv / df['volume'].rolling(window=window, min_periods=window).sum()
+
+
+def compute_indicator(df: pd.DataFrame, spec: str) -> pd.DataFrame:
+    """
+    Compute one indicator over the whole of df
+
+    Args:
+        df (pd.DataFrame): OHLCV data sorted by tradingDate
+        spec (str): Indicator spec, e.g. 'EMA(50)'
+
+    Returns:
+        pd.DataFrame: Indicator columns named after the canonical spec
+                      (multi-line indicators add a suffix, e.g. 'MACD(12,26,9) signal')
+    """
+    name, params = parse_indicator(spec)
+    label = canonical_spec(spec)
+    close = df['close']
+    if name == 'SMA':
+        return pd.DataFrame({label: sma(close, *params)})
+    if name == 'EMA':
+        return pd.DataFrame({label: ema(close, *params)})
+    if name == 'RSI':
+        return pd.DataFrame({label: rsi(close, *params)})
+    if name == 'ATR':
+        return pd.DataFrame({label: atr(df, *params)})
+    if name == 'VWAP':
+        return pd.DataFrame({label: vwap(df, *params)})
+    if name == 'MACD':
+        result = macd(close, *params)
+    else:
+        result = bollinger(close, *params)
+    return result.rename(columns=lambda col: label if col in ('macd', 'mid') else f"{label} {col}")
+
+
+def data_version(df: pd.DataFrame) -> tuple:
+    """
+    Cheap fingerprint of an OHLCV history: changes whenever bars are added or revised
+
+    Args:
+        df (pd.DataFrame): OHLCV data sorted by tradingDate
+
+    Returns:
+        tuple: Hashable version key
+    """
+    if df is None or df.empty:
+        return (0,)
+    last = df.iloc[-1]
+    return (len(df), df['tradingDate'].iloc[0], last['tradingDate'], float(last['close']), float(last['volume']))
+
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def get_indicators(df: pd.DataFrame, specs: list, key: str = None, start_date: str = None) -> pd.DataFrame:
+    """
+    Get indicators for a full history, memoized per (key, data version, spec),
+    and optionally sliced to a start date
+
+    Args:
+        df (pd.DataFrame): Full OHLCV history sorted by tradingDate
+        specs (list): Indicator specs, e.g. ['SMA(20)', 'RSI(14)']
+        key (str): Memo key for the history, e.g. ticker and resolution (None disables memoization)
+        start_date (str): Only return rows on or after this date
+
+    Returns:
+        pd.DataFrame: tradingDate plus one column per indicator line
+    """
+    version = data_version(df)
+    frames = []
+    for spec in specs:
+        memo_key = (key, version, canonical_spec(spec))
+        with _memo_lock:
+            result = _memo.get(memo_key) if key is not None else None
+            if result is not None:
+                _memo.move_to_end(memo_key)
+        if result is None:
+            result = compute_indicator(df, spec)
+            if key is not None:
+                with _memo_lock:
+                    _memo[memo_key] = result
+                    while len(_memo) > MEMO_MAX_ENTRIES:
+                        _memo.popitem(last=False)
+        frames.append(result)
+
+    out = df[['tradingDate']].copy()
+    for result in frames:
+        for col in result.columns:
+            out[col] = result[col].to_numpy()
+    if start_date is not None:
+        out = out[out['tradingDate'] >= start_date]
+    return out
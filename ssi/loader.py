@@ -6,23 +6,94 @@ Main interface for loading ticker data with caching and error handling
 import streamlit as st
 from datetime import datetime
 from .fetch import fetch_historical_price, validate_ticker
-from .chart import create_ohlcv_candlestick, create_simple_line_chart
+from .chart import DEFAULT_INDICATORS, create_ohlcv_candlestick, create_simple_line_chart
+from .decimate import MAX_BARS
+from .resample import RESOLUTIONS, period_start, resample_ohlcv
+from .tracing import span
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_ticker_price(ticker: str, start_date: str = None) -> 'plotly.graph_objects.Figure':
+# Histories are cached from this date, whatever the visible window
+HISTORY_START = '2010-01-01'
+
+# Full histories kept in memory (least recently used are evicted first)
+HISTORY_CACHE_ENTRIES = 128
+
+
+def history_start(start_date: str) -> str:
+    """
+    Normalize a requested start date to the start of the cached history.
+    Any date from HISTORY_START onwards shares one cache entry; earlier
+    dates round down to January 1 of their year.
+    
+    Args:
+        start_date (str): Start date in 'YYYY-MM-DD' format
+        
+    Returns:
+        str: History start date in 'YYYY-MM-DD' format
+    """
+    if start_date >= HISTORY_START:
+        return HISTORY_START
+    return f"{start_date[:4]}-01-01"
+
+
+@st.cache_data(ttl=3600, max_entries=HISTORY_CACHE_ENTRIES, show_spinner=False)  # Cache for 1 hour, LRU-bounded
+def load_history(ticker: str, start: str = HISTORY_START) -> 'pd.DataFrame':
+    """
+    Load the full daily history of a ticker once; every chart and slice is
+    derived from it, so changing the start date never hits the network.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        start (str): History start date, normalized with history_start()
+        
+    Returns:
+        pd.DataFrame: Daily OHLCV data or None if unavailable (callers drop None entries
+                      from the cache, see _get_history)
+    """
+    return fetch_historical_price(ticker, start)
+
+
+def _get_history(ticker: str, start_date: str, resolution: str) -> 'pd.DataFrame':
+    if resolution not in RESOLUTIONS:
+        st.error(f"Invalid resolution: {resolution}. Please use one of {', '.join(RESOLUTIONS)}.")
+        return None
+    try:
+        start = history_start(start_date)
+    except TypeError:
+        st.error(f"Invalid date format: {start_date}. Please use YYYY-MM-DD format.")
+        return None
+    df = load_history(ticker, start)
+    if df is None:
+        # Failures are not kept: the next view of the ticker retries instead of waiting out the TTL
+        load_history.clear(ticker, start)
+    return resample_ohlcv(df, resolution)
+
+
+def load_ticker_price(ticker: str, start_date: str = None, resolution: str = 'D',
+                      max_bars: int = MAX_BARS,
+                      indicators: tuple = DEFAULT_INDICATORS) -> 'plotly.graph_objects.Figure':
     """
     Load OHLCV data for a specific ticker and create chart.
     This is the main function used in the dashboard.
+    Data comes from the cached full history; the figure itself is cheap to
+    build and is not cached.
     
     Args:
         ticker (str): Stock ticker symbol
         start_date (str): Start date in 'YYYY-MM-DD' format
+        resolution (str): Bar size: 'D', 'W', 'M' or 'Q'
+        max_bars (int): Candle budget; longer ranges are decimated (None to disable)
+        indicators (tuple): Indicator specs, e.g. ('SMA(20)', 'RSI(14)')
         
     Returns:
         plotly.graph_objects.Figure: Chart figure object
     """
     
+    with span("load_ticker_price", ticker=ticker, resolution=resolution, start_date=start_date):
+        return _load_ticker_price(ticker, start_date, resolution, max_bars, indicators)
+
+
+def _load_ticker_price(ticker, start_date, resolution, max_bars, indicators):
     # Validate ticker
     if not validate_ticker(ticker):
         st.error(f"Invalid ticker symbol: {ticker}")
@@ -32,8 +103,10 @@ def load_ticker_price(ticker: str, start_date: str = None) -> 'plotly.graph_obje
     if start_date is None:
         start_date = datetime(datetime.today().year, 1, 1).strftime('%Y-%m-%d')
     
-    # Fetch data
-    df = fetch_historical_price(ticker, start_date)
+    # Full history, so indicators are warmed up at the start of the window
+    with span("loader.history", ticker=ticker) as history_span:
+        df = _get_history(ticker, start_date, resolution)
+        history_span.set(bars=0 if df is None else len(df))
     
     if df is None or df.empty:
         st.error(f"Unable to fetch data for ticker: {ticker}")
@@ -41,23 +114,14 @@ def load_ticker_price(ticker: str, start_date: str = None) -> 'plotly.graph_obje
     
     # Create chart
     try:
-        fig = create_ohlcv_candlestick(df, ticker, start_date)
-        
-        # Debug: kiểm tra layout config trước khi return
-        print(f"Debug - Chart created for {ticker}:")
-        print(f"xaxis showgrid: {fig.layout.xaxis.showgrid}")
-        print(f"xaxis tickformat: {fig.layout.xaxis.tickformat}")
-        print(f"xaxis2 showgrid: {fig.layout.xaxis2.showgrid}")
-        print(f"xaxis2 tickformat: {fig.layout.xaxis2.tickformat}")
-        
-        return fig
+        return create_ohlcv_candlestick(df, ticker, start_date, resolution=resolution, max_bars=max_bars,
+                                        indicators=tuple(indicators))
     except Exception as e:
         st.error(f"Error creating chart for {ticker}: {str(e)}")
         return create_simple_line_chart(df, ticker, start_date)
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_ticker_data(ticker: str, start_date: str = None) -> 'pd.DataFrame':
+def get_ticker_data(ticker: str, start_date: str = None, resolution: str = 'D') -> 'pd.DataFrame':
     """
     Get raw ticker data without creating chart.
     Useful for data analysis or custom chart creation.
@@ -65,6 +129,7 @@ def get_ticker_data(ticker: str, start_date: str = None) -> 'pd.DataFrame':
     Args:
         ticker (str): Stock ticker symbol
         start_date (str): Start date in 'YYYY-MM-DD' format
+        resolution (str): Bar size: 'D', 'W', 'M' or 'Q'
         
     Returns:
         pd.DataFrame: Raw OHLCV data
@@ -79,8 +144,10 @@ def get_ticker_data(ticker: str, start_date: str = None) -> 'pd.DataFrame':
     if start_date is None:
         start_date = datetime(datetime.today().year, 1, 1).strftime('%Y-%m-%d')
     
-    # Fetch data
-    df = fetch_historical_price(ticker, start_date)
+    # Slice the cached history, keeping the whole W/M/Q bar that contains start_date
+    df = _get_history(ticker, start_date, resolution)
+    if df is not None:
+        df = df[df['tradingDate'] >= period_start(start_date, resolution)].reset_index(drop=True)
     
     if df is None or df.empty:
         st.error(f"Unable to fetch data for ticker: {ticker}")
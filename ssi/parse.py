@@ -0,0 +1,103 @@
+"""
+SSI Payload Parsing Module
+Fast, typed decoding of TCBS bar payloads into columnar DataFrames
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .store import MARKET_TZ
+
+# orjson is optional: it decodes large payloads several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+def loads(content):
+    """
+    Decode a JSON document, using orjson when it is installed
+
+    Args:
+        content (bytes | str): Raw JSON
+
+    Returns:
+        Decoded JSON payload
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _parse_dates(values: list) -> np.ndarray:
+    # The format is detected once per payload from the first bar
+    first = values[0]
+    if isinstance(first, str):
+        if first.endswith('Z'):
+            # UTC ISO strings: NumPy parses these directly once the 'Z' is dropped
+            try:
+                return np.array([value[:-1] for value in values], dtype='datetime64[ms]')
+            except (TypeError, ValueError):
+                pass
+        # Offsets are resolved to market time before the zone is dropped, so a bar stays on its
+        # trading day ('2024-01-02T00:00:00+07:00' -> 2024-01-02 00:00, not 2024-01-01 17:00 UTC)
+        dates = pd.to_datetime(values, format='ISO8601', utc=True).tz_convert(MARKET_TZ).tz_localize(None)
+        return dates.values.astype('datetime64[ms]')
+    return np.asarray(values, dtype='int64').astype('datetime64[ms]')
+
+
+def _parse_bars_generic(bars: list, price_dtype) -> pd.DataFrame:
+    df = pd.DataFrame(bars)
+    df = df[[col for col in ['tradingDate', *PRICE_COLUMNS, 'volume'] if col in df.columns]]
+    # Bars without a date cannot be placed on the chart or stored
+    df = df[df['tradingDate'].notna()].reset_index(drop=True)
+    dates = df['tradingDate'].tolist()
+    df['tradingDate'] = _parse_dates(dates) if dates else np.array([], dtype='datetime64[ms]')
+    df = df[df['tradingDate'].notna()]
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(price_dtype)
+    if 'volume' in df.columns:
+        # The store keeps volume as an integer; a missing volume counts as no trades
+        df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype(np.int64)
+    return df.sort_values('tradingDate', kind='stable', ignore_index=True)
+
+
+def parse_bars(bars: list, price_dtype=np.float64) -> pd.DataFrame:
+    """
+    Build a typed OHLCV DataFrame from a list of TCBS bar records.
+    Columns are extracted straight into NumPy arrays (datetime64 dates,
+    float prices, int64 volume); the sort is skipped when the upstream
+    data is already in date order.
+
+    Args:
+        bars (list): Bar records, e.g. payload['data']
+        price_dtype: NumPy dtype for the OHLC columns (float64 or float32)
+
+    Returns:
+        pd.DataFrame: DataFrame with tradingDate, open, high, low, close, volume
+    """
+    n = len(bars)
+    try:
+        columns = {'tradingDate': _parse_dates([bar['tradingDate'] for bar in bars])}
+        for col in PRICE_COLUMNS:
+            columns[col] = np.fromiter((bar[col] for bar in bars), dtype=price_dtype, count=n)
+        columns['volume'] = np.fromiter((bar['volume'] for bar in bars), dtype=np.int64, count=n)
+    except (KeyError, TypeError, ValueError):
+        # Missing fields or nulls: fall back to pandas inference
+        return _parse_bars_generic(bars, price_dtype)
+    if np.isnat(columns['tradingDate']).any():
+        return _parse_bars_generic(bars, price_dtype)
+
+    dates = columns['tradingDate']
+    if n > 1 and not (dates[1:] >= dates[:-1]).all():
+        order = np.argsort(dates, kind='stable')
+        columns = {col: values[order] for col, values in columns.items()}
+
+    return pd.DataFrame(columns, copy=False)
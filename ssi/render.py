@@ -0,0 +1,45 @@
+"""
+SSI Render Module
+Choice between SVG and WebGL scatter traces by the number of points a figure holds
+"""
+
+import os
+
+
+# 'auto' switches line/marker traces to WebGL above WEBGL_THRESHOLD points per figure;
+# 'svg' and 'webgl' force one renderer
+RENDER_MODE = os.environ.get("CHART_RENDER_MODE", "auto")
+WEBGL_THRESHOLD = int(os.environ.get("CHART_WEBGL_THRESHOLD", 5000))
+
+
+def use_webgl(n_points: int, mode: str = None) -> bool:
+    """
+    Whether a figure with n_points scatter points should render with WebGL
+
+    Args:
+        n_points (int): Total points across the figure's scatter traces
+        mode (str): 'auto', 'svg' or 'webgl' (defaults to RENDER_MODE)
+
+    Returns:
+        bool: True for WebGL traces
+    """
+    mode = mode or RENDER_MODE
+    if mode == 'webgl':
+        return True
+    if mode == 'svg':
+        return False
+    return n_points > WEBGL_THRESHOLD
+
+
+def scatter_type(n_points: int, mode: str = None) -> str:
+    """
+    Trace type for scatter/line traces: 'scattergl' or 'scatter'
+
+    Args:
+        n_points (int): Total points across the figure's scatter traces
+        mode (str): 'auto', 'svg' or 'webgl' (defaults to RENDER_MODE)
+
+    Returns:
+        str: Plotly trace type
+    """
+    return 'scattergl' if use_webgl(n_points, mode) else 'scatter'
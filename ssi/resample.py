@@ -0,0 +1,91 @@
+"""
+SSI Resampling Module
+Vectorized OHLCV aggregation of daily bars into coarser resolutions
+"""
+
+import numpy as np
+import pandas as pd
+
+
+RESOLUTIONS = {
+    'D': 'Daily',
+    'W': 'Weekly',
+    'M': 'Monthly',
+    'Q': 'Quarterly',
+}
+
+
+def _period_keys(dates: np.ndarray, resolution: str) -> np.ndarray:
+    if resolution == 'W':
+        # 1970-01-01 was a Thursday: shift by 3 days so weeks start on Monday
+        return (dates.astype('datetime64[D]').astype('int64') + 3) // 7
+    months = dates.astype('datetime64[M]').astype('int64')
+    return months // 3 if resolution == 'Q' else months
+
+
+def period_start(date, resolution: str = 'D') -> pd.Timestamp:
+    """
+    First day of the resolution's period containing a date. Buckets are
+    labelled with their first bar's date, so filtering resampled bars with
+    tradingDate >= period_start(start_date, resolution) keeps the partial
+    period that contains start_date.
+
+    Args:
+        date (str | datetime): Date, e.g. a 'YYYY-MM-DD' start date
+        resolution (str): One of 'D', 'W', 'M', 'Q'
+
+    Returns:
+        pd.Timestamp: Monday of the week, first of the month or quarter, or the day itself for 'D'
+    """
+    day = np.datetime64(pd.Timestamp(date).date(), 'D')
+    if resolution == 'D':
+        return pd.Timestamp(day)
+    key = _period_keys(np.array([day]), resolution)[0]
+    if resolution == 'W':
+        return pd.Timestamp(np.datetime64(int(key * 7 - 3), 'D'))
+    return pd.Timestamp(np.datetime64(int(key * 3 if resolution == 'Q' else key), 'M'))
+
+
+def aggregate_ohlcv(df: pd.DataFrame, starts: np.ndarray) -> pd.DataFrame:
+    """
+    Aggregate consecutive runs of bars into one bar each: first open,
+    max high, min low, last close and summed volume. Each bucket is
+    labelled with the tradingDate of its first bar.
+
+    Args:
+        df (pd.DataFrame): OHLCV data sorted by tradingDate
+        starts (np.ndarray): Row index where each bucket begins (ascending, starting at 0)
+
+    Returns:
+        pd.DataFrame: One row per bucket
+    """
+    ends = np.append(starts[1:], len(df)) - 1
+    return pd.DataFrame({
+        'tradingDate': df['tradingDate'].values[starts],
+        'open': df['open'].values[starts],
+        'high': np.maximum.reduceat(df['high'].values, starts),
+        'low': np.minimum.reduceat(df['low'].values, starts),
+        'close': df['close'].values[ends],
+        'volume': np.add.reduceat(df['volume'].values, starts),
+    })
+
+
+def resample_ohlcv(df: pd.DataFrame, resolution: str = 'D') -> pd.DataFrame:
+    """
+    Resample daily bars to weekly, monthly or quarterly bars
+
+    Args:
+        df (pd.DataFrame): Daily OHLCV data sorted by tradingDate
+        resolution (str): One of 'D', 'W', 'M', 'Q'
+
+    Returns:
+        pd.DataFrame: OHLCV data at the requested resolution
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unsupported resolution: {resolution}. Use one of {', '.join(RESOLUTIONS)}.")
+    if resolution == 'D' or df is None or df.empty:
+        return df
+
+    keys = _period_keys(df['tradingDate'].values, resolution)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return aggregate_ohlcv(df, starts)
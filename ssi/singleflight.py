@@ -0,0 +1,76 @@
+"""
+SSI Single-Flight Module
+Coalesces concurrent identical calls into one in-flight execution
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Duplicate call suppression keyed by an arbitrary hashable key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block until it finishes and receive the same result (or
+    exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs) -> tuple:
+        """
+        Run fn(*args, **kwargs) once per in-flight key
+
+        Args:
+            key: Hashable key identifying identical calls
+            fn (callable): Function to run
+
+        Returns:
+            tuple: (result, shared) where shared is True if the result was
+                   produced by another caller's execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
+
+    def in_flight(self) -> int:
+        """
+        Get the number of keys currently being executed
+
+        Returns:
+            int: In-flight call count
+        """
+        with self._lock:
+            return len(self._calls)
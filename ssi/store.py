@@ -0,0 +1,250 @@
+"""
+SSI Price Store Module
+Persistent on-disk store for daily OHLCV bars, backed by SQLite
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parents[1] / "data" / "price_store.sqlite"
+
+MARKET_TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+MARKET_OPEN = (9, 0)
+MARKET_CLOSE = (15, 0)
+
+# How long a delta check stays valid while the market is in session
+REFRESH_SECONDS = 15 * 60
+
+OHLCV_COLUMNS = ['tradingDate', 'open', 'high', 'low', 'close', 'volume']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    trading_ms INTEGER NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    PRIMARY KEY (ticker, trading_ms)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker TEXT PRIMARY KEY,
+    first_ts INTEGER NOT NULL,
+    last_ms INTEGER,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+def last_market_close(now: datetime = None) -> datetime:
+    """
+    Get the most recent daily session close at or before `now`
+
+    Args:
+        now (datetime): Reference time (defaults to current time)
+
+    Returns:
+        datetime: Timezone-aware datetime of the last close
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    close = now.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
+    if now < close:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:  # Saturday / Sunday
+        close -= timedelta(days=1)
+    return close
+
+
+def is_market_open(now: datetime = None) -> bool:
+    """
+    Check whether the daily session is currently running
+
+    Args:
+        now (datetime): Reference time (defaults to current time)
+
+    Returns:
+        bool: True during weekday trading hours
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    if now.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= (now.hour, now.minute) < MARKET_CLOSE
+
+
+def _checked_recently(checked_at: float, now: datetime = None) -> bool:
+    now = now or datetime.now(MARKET_TZ)
+    if is_market_open(now):
+        return now.timestamp() - checked_at < REFRESH_SECONDS
+    return checked_at >= last_market_close(now).timestamp()
+
+
+class PriceStore:
+    """
+    SQLite-backed store of daily bars keyed by ticker.
+
+    Alongside the bars, a coverage row per ticker records the earliest
+    requested `from` timestamp, the last stored `tradingDate` and when the
+    network was last checked, so callers only need to fetch the delta.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get("SSI_PRICE_STORE", DEFAULT_STORE_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread: Streamlit serves each session on its own thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def coverage(self, ticker: str):
+        """
+        Get stored coverage for a ticker
+
+        Args:
+            ticker (str): Stock ticker symbol
+
+        Returns:
+            tuple: (first_ts, last_ms, checked_at) or None if never stored
+        """
+        return self._connect().execute(
+            "SELECT first_ts, last_ms, checked_at FROM coverage WHERE ticker = ?", (ticker,)
+        ).fetchone()
+
+    def is_fresh(self, ticker: str, now: datetime = None) -> bool:
+        """
+        Check whether stored bars for a ticker are up to date
+
+        Outside trading hours bars are fresh once checked after the last close;
+        during the session the intraday bar is re-checked every REFRESH_SECONDS.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            now (datetime): Reference time (defaults to current time)
+
+        Returns:
+            bool: True if no network check is needed
+        """
+        cov = self.coverage(ticker)
+        return cov is not None and _checked_recently(cov[2], now)
+
+    def fresh_tickers(self, now: datetime = None) -> set:
+        """
+        Get all tickers whose stored bars are up to date
+
+        Args:
+            now (datetime): Reference time (defaults to current time)
+
+        Returns:
+            set: Ticker symbols that need no network check
+        """
+        rows = self._connect().execute("SELECT ticker, checked_at FROM coverage").fetchall()
+        return {ticker for ticker, checked_at in rows if _checked_recently(checked_at, now)}
+
+    def write(self, ticker: str, df: pd.DataFrame, first_ts: int) -> None:
+        """
+        Upsert bars for a ticker and update its coverage
+
+        Args:
+            ticker (str): Stock ticker symbol
+            df (pd.DataFrame): OHLCV data (may be None or empty)
+            first_ts (int): Earliest `from` timestamp (seconds) now covered
+        """
+        rows = []
+        if df is not None and not df.empty:
+            dates = pd.to_datetime(df['tradingDate'])
+            if dates.dt.tz is not None:
+                dates = dates.dt.tz_convert(None)
+            trading_ms = dates.astype('datetime64[ms]').astype('int64')
+            rows = list(zip(
+                trading_ms.tolist(),
+                df['open'].tolist(), df['high'].tolist(), df['low'].tolist(),
+                df['close'].tolist(), df['volume'].astype('int64').tolist()
+            ))
+        with self._write_lock:
+            conn = self._connect()
+            with conn:
+                if rows:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(ticker, *row) for row in rows]
+                    )
+                conn.execute(
+                    """
+                    INSERT INTO coverage (ticker, first_ts, last_ms, checked_at)
+                    VALUES (?, ?, (SELECT MAX(trading_ms) FROM bars WHERE ticker = ?), ?)
+                    ON CONFLICT(ticker) DO UPDATE SET
+                        first_ts = MIN(first_ts, excluded.first_ts),
+                        last_ms = excluded.last_ms,
+                        checked_at = excluded.checked_at
+                    """,
+                    (ticker, int(first_ts), ticker, time.time())
+                )
+
+    def read(self, ticker: str, start_ts: int = None) -> pd.DataFrame:
+        """
+        Read stored bars for a ticker
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_ts (int): Only return bars on or after this timestamp (seconds)
+
+        Returns:
+            pd.DataFrame: OHLCV data sorted by tradingDate
+        """
+        start_ms = int(start_ts) * 1000 if start_ts is not None else 0
+        rows = self._connect().execute(
+            "SELECT trading_ms, open, high, low, close, volume FROM bars "
+            "WHERE ticker = ? AND trading_ms >= ? ORDER BY trading_ms",
+            (ticker, start_ms)
+        ).fetchall()
+        df = pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+        df['tradingDate'] = pd.to_datetime(df['tradingDate'].astype('int64'), unit='ms')
+        df['volume'] = df['volume'].astype('int64')
+        return df
+
+    def tickers(self) -> list:
+        """
+        List tickers with stored coverage
+
+        Returns:
+            list: Ticker symbols
+        """
+        return [row[0] for row in self._connect().execute("SELECT ticker FROM coverage")]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """
+    Get the process-wide price store, creating it on first use
+
+    Returns:
+        PriceStore: Shared store instance
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore()
+    return _store
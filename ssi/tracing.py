@@ -0,0 +1,239 @@
+"""
+SSI Tracing Module
+Lightweight timed spans across the price pipeline, kept in a ring buffer of recent traces
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# Recent root traces kept in memory
+TRACE_BUFFER_SIZE = int(os.environ.get("SSI_TRACE_BUFFER", 200))
+
+# SSI_TRACING=0 turns span recording off entirely
+TRACING_ENABLED = os.environ.get("SSI_TRACING", "1") != "0"
+
+# SSI_TRACE_LOG=1 emits one JSON line per finished span on the 'ssi.tracing' logger (stderr)
+TRACE_LOG = os.environ.get("SSI_TRACE_LOG", "0") not in ("", "0")
+
+# SSI_TRACE_PANEL=1 shows the slowest stages in the dashboard sidebar
+TRACE_PANEL = os.environ.get("SSI_TRACE_PANEL", "0") not in ("", "0")
+
+logger = logging.getLogger("ssi.tracing")
+if TRACE_LOG and not logger.handlers:
+    # Bare JSON lines on stderr; not propagated, so a root handler does not print them twice
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_traces = deque(maxlen=TRACE_BUFFER_SIZE)
+_traces_lock = threading.Lock()
+_local = threading.local()
+
+
+class Span:
+    """
+    One timed stage of a trace.
+
+    Attributes:
+        name (str): Stage name, e.g. 'fetch.request'
+        attributes (dict): Ticker, bar count and other context
+        trace_id (str): Id shared by every span of the trace
+        started_at (float): Wall-clock start (Unix seconds)
+        duration_ms (float): Elapsed time, set when the span ends
+        children (list): Nested spans, in start order
+    """
+
+    __slots__ = ('name', 'attributes', 'trace_id', 'parent', 'started_at', 'duration_ms', 'children', '_start')
+
+    def __init__(self, name: str, attributes: dict, parent: 'Span' = None):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.duration_ms = None
+        self.children = []
+        self._start = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def walk(self):
+        """Yield this span and all nested spans, depth first"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'duration_ms': self.duration_ms,
+            'attributes': self.attributes,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+class _NoopSpan:
+    def set(self, **attributes) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def current_span() -> Span:
+    """
+    Innermost open span of the calling thread
+
+    Returns:
+        Span: Open span, or a no-op span outside any trace
+    """
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else _NOOP
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as a named span. Spans opened inside it (on the same
+    thread) become its children; a span with no open parent starts a new
+    trace, which is added to the ring buffer when it ends.
+
+    Args:
+        name (str): Stage name, e.g. 'chart.figure'
+        **attributes: Context such as ticker=... or bars=...
+
+    Yields:
+        Span: The open span; call .set(...) to add attributes
+    """
+    if not TRACING_ENABLED:
+        yield _NOOP
+        return
+
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    parent = stack[-1] if stack else None
+    current = Span(name, attributes, parent)
+    if parent is not None:
+        parent.children.append(current)
+    stack.append(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes['error'] = type(e).__name__
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - current._start) * 1e3
+        stack.pop()
+        if TRACE_LOG:
+            _log_span(current)
+        if parent is None:
+            with _traces_lock:
+                _traces.append(current)
+
+
+def _log_span(current: Span) -> None:
+    record = {
+        'ts': current.started_at,
+        'trace_id': current.trace_id,
+        'span': current.name,
+        'parent': current.parent.name if current.parent is not None else None,
+        'duration_ms': round(current.duration_ms, 3),
+        **current.attributes,
+    }
+    logger.info(json.dumps(record, default=str))
+
+
+def recent_traces(limit: int = None) -> list:
+    """
+    Most recent finished traces, newest first
+
+    Args:
+        limit (int): Maximum number of traces (None for the whole buffer)
+
+    Returns:
+        list: Root spans
+    """
+    with _traces_lock:
+        traces = list(_traces)
+    traces.reverse()
+    return traces[:limit] if limit else traces
+
+
+def stage_stats(traces: list = None) -> list:
+    """
+    Latency per stage name over the buffered traces
+
+    Args:
+        traces (list): Root spans (defaults to the whole buffer)
+
+    Returns:
+        list: One dict per stage (stage, count, p50_ms, p95_ms, max_ms,
+              total_ms), slowest p95 first
+    """
+    durations = {}
+    for root in recent_traces() if traces is None else traces:
+        for item in root.walk():
+            durations.setdefault(item.name, []).append(item.duration_ms)
+
+    stats = []
+    for name, values in durations.items():
+        values = np.asarray(values)
+        stats.append({
+            'stage': name,
+            'count': len(values),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95)),
+            'max_ms': float(values.max()),
+            'total_ms': float(values.sum()),
+        })
+    return sorted(stats, key=lambda row: row['p95_ms'], reverse=True)
+
+
+def clear() -> None:
+    """Drop all buffered traces"""
+    with _traces_lock:
+        _traces.clear()
+
+
+def show_trace_panel(limit: int = 8) -> None:
+    """
+    Render the slowest recent stages in the Streamlit sidebar.
+    Opt-in: does nothing unless SSI_TRACE_PANEL is set.
+
+    Args:
+        limit (int): Number of stages and traces to show
+    """
+    if not TRACE_PANEL:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Performance trace", expanded=False):
+        stats = stage_stats()
+        if not stats:
+            st.caption("No traces recorded yet")
+            return
+        st.caption(f"Slowest stages over the last {len(recent_traces())} traces")
+        st.dataframe(
+            pd.DataFrame(stats[:limit]).drop(columns='total_ms'),
+            hide_index=True,
+            column_config={col: st.column_config.NumberColumn(format="%.1f")
+                           for col in ('p50_ms', 'p95_ms', 'max_ms')},
+        )
+        slowest = sorted(recent_traces(), key=lambda root: root.duration_ms, reverse=True)[:limit]
+        for root in slowest:
+            ticker = root.attributes.get('ticker', '')
+            st.caption(f"{root.name} {ticker}: {root.duration_ms:.0f} ms")
@@ -0,0 +1,175 @@
+"""
+SSI Cache Warmer Module
+Background thread that pre-populates the price store for the ticker universe
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from .fetch import fetch_many
+from .loader import HISTORY_CACHE_ENTRIES, HISTORY_START, get_available_tickers, history_start, load_history
+from .store import MARKET_TZ, get_price_store
+
+
+MKTCAP_PATH = Path(__file__).resolve().parents[1] / "data" / "MktCap_processed.csv"
+
+# Warm run time after the session close, Vietnam time
+WARM_AT = (15, 30)
+
+
+def get_ticker_universe(limit: int = None) -> list:
+    """
+    Get the tickers to keep warm: the common tickers first, then every
+    listed ticker from MktCap_processed.csv ordered by CUR_MKT_CAP
+
+    Args:
+        limit (int): Maximum number of tickers to return
+
+    Returns:
+        list: Ticker symbols
+    """
+    tickers = get_available_tickers()
+    try:
+        mcap = pd.read_csv(MKTCAP_PATH, usecols=['TICKER', 'CUR_MKT_CAP'])
+        mcap = mcap.sort_values('CUR_MKT_CAP', ascending=False)
+        tickers = tickers + mcap['TICKER'].dropna().astype(str).tolist()
+    except (OSError, ValueError):
+        pass
+    tickers = list(dict.fromkeys(tickers))  # De-duplicate, keep order
+    return tickers[:limit] if limit else tickers
+
+
+def next_warm_time(now: datetime = None) -> datetime:
+    """
+    Get the next scheduled warm run (WARM_AT on the next weekday)
+
+    Args:
+        now (datetime): Reference time (defaults to current time)
+
+    Returns:
+        datetime: Timezone-aware datetime of the next run
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    run = now.replace(hour=WARM_AT[0], minute=WARM_AT[1], second=0, microsecond=0)
+    if run <= now:
+        run += timedelta(days=1)
+    while run.weekday() >= 5:
+        run += timedelta(days=1)
+    return run
+
+
+class CacheWarmer(threading.Thread):
+    """
+    Daemon thread that warms the price caches on a schedule.
+
+    It runs once at start-up and again after every market close, fetching
+    the universe in market-cap order with bounded concurrency so the first
+    view of any ticker is served from disk. The leading memory_tickers of
+    the universe are also loaded into the in-process history cache, so
+    their first view skips the store read and parse as well.
+    """
+
+    def __init__(self, tickers: list = None, start_date: str = None, max_concurrency: int = 4,
+                 memory_tickers: int = HISTORY_CACHE_ENTRIES):
+        super().__init__(name="ssi-cache-warmer", daemon=True)
+        self.tickers = tickers or get_ticker_universe()
+        self.start_date = start_date or HISTORY_START  # Same range the loader caches
+        self.max_concurrency = max_concurrency
+        # More than the history cache holds would only evict each other
+        self.memory_tickers = min(memory_tickers, HISTORY_CACHE_ENTRIES)
+        self.in_memory = 0
+        self.failures = {}
+        self.last_run = None
+        self.last_duration = None
+        self.next_run = None
+        self.running = False
+        self._stop_event = threading.Event()
+
+    def warm(self) -> None:
+        """
+        Fetch every stale ticker of the universe into the price store, then
+        reload the leading tickers' histories into the in-process cache
+        """
+        self.running = True
+        started = time.monotonic()
+        try:
+            fresh = get_price_store().fresh_tickers()
+            stale = [ticker for ticker in self.tickers if ticker not in fresh]
+            _, self.failures = fetch_many(stale, self.start_date, max_concurrency=self.max_concurrency)
+            self.in_memory = self._warm_histories()
+        finally:
+            self.running = False
+            self.last_run = datetime.now(MARKET_TZ)
+            self.last_duration = time.monotonic() - started
+
+    def _warm_histories(self) -> int:
+        start = history_start(self.start_date)
+        loaded = 0
+        for ticker in self.tickers[:self.memory_tickers]:
+            if ticker in self.failures:
+                continue
+            # Replace entries cached before this run's new bars; reads come from the store just filled
+            load_history.clear(ticker, start)
+            loaded += load_history(ticker, start) is not None
+        return loaded
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.warm()
+            except Exception as e:
+                self.failures = {'*': str(e)}
+            self.next_run = next_warm_time()
+            self._stop_event.wait((self.next_run - datetime.now(MARKET_TZ)).total_seconds())
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def status(self) -> dict:
+        """
+        Get a readout of how much of the universe is warm
+
+        Returns:
+            dict: total, warm (in the price store), in_memory (history cache)
+                  and failed ticker counts, warm percentage, run state and
+                  last/next run times
+        """
+        fresh = get_price_store().fresh_tickers()
+        warm = sum(ticker in fresh for ticker in self.tickers)
+        total = len(self.tickers)
+        return {
+            'total': total,
+            'warm': warm,
+            'in_memory': self.in_memory,
+            'failed': len(self.failures),
+            'warm_pct': warm / total * 100 if total else 0.0,
+            'running': self.running,
+            'last_run': self.last_run,
+            'last_duration': self.last_duration,
+            'next_run': self.next_run,
+        }
+
+
+@st.cache_resource
+def start_cache_warmer(max_concurrency: int = 4) -> CacheWarmer:
+    """
+    Start the background cache warmer once per server process.
+    Opt-in: returns None unless the SSI_CACHE_WARMER environment variable is set.
+
+    Args:
+        max_concurrency (int): Maximum number of tickers fetched at once
+
+    Returns:
+        CacheWarmer: The running warmer, or None if disabled
+    """
+    if os.environ.get("SSI_CACHE_WARMER", "").lower() not in ("1", "true", "yes"):
+        return None
+    warmer = CacheWarmer(max_concurrency=max_concurrency)
+    warmer.start()
+    return warmer
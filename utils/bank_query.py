@@ -0,0 +1,130 @@
+"""
+Bank Query Module
+Registry of keycode blocks and slice-and-transpose queries over the typed bank store
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.bank_store import period_key, period_label
+from utils.tables import scale_rows
+from utils.ticker_index import TickerIndex
+
+
+# Block key -> (tab title, keycodes in display order)
+METRIC_BLOCKS = {
+    # Net interest income, interest income/expense, net fees, TOI, G&A, PPOP, provisions, PBT, NPATMI
+    'IS': ("Income Statement", ['IS.3', 'IS.1', 'IS.2', 'IS.6', 'IS.14', 'IS.15', 'IS.16', 'IS.17', 'IS.18', 'IS.24']),
+    # Total assets, total credit, loans, government bonds, deposits, equity
+    'SIZE': ("Sizes", ['BS.1', 'CA.16', 'BS.13', 'Nt.97', 'BS.56', 'BS.65']),
+    # Asset/loan/bond/deposit yields, funding costs (total, deposit, loan, valuable paper), NIM, provision/PPOP, CIR
+    'EQ': ("Earnings Quality", ['CA.25', 'CA.35', 'CA.38', 'CA.41', 'CA.26', 'CA.44', 'CA.47', 'CA.49',
+                                'CA.27', 'CA.28', 'CA.14']),
+    # NPL, NPL formation, group 5, G2 formation, LLR
+    'AQ': ("Asset Quality", ['CA.5', 'CA.13', 'CA.6', 'CA.10', 'CA.15']),
+}
+
+
+def register_block(key: str, title: str, keycodes: list) -> None:
+    """
+    Add (or replace) a keycode block
+
+    Args:
+        key (str): Block key, e.g. 'CAPITAL'
+        title (str): Display title
+        keycodes (list): Keycodes in display order
+    """
+    METRIC_BLOCKS[key] = (title, list(keycodes))
+
+
+class BankQuery:
+    """
+    Block queries over the bank store indexed by (ticker, period). A
+    single-bank query is the ticker's contiguous row range from a start
+    period; a multi-bank query is the rows of one period. Either way the
+    block's columns are sliced and transposed into a keycode x period (or
+    keycode x ticker) table, scaled and labelled for display.
+
+    Attributes:
+        index (TickerIndex): Store rows sorted by ticker then PERIOD
+        names (dict): Keycode -> display name
+        factors (dict): Keycode -> display factor
+    """
+
+    def __init__(self, store: pd.DataFrame, names: dict = None, factors: dict = None):
+        """
+        Args:
+            store (pd.DataFrame): Typed bank store (utils.bank_store.load_bank_store)
+            names (dict): Keycode -> display name for row labels
+            factors (dict): Keycode -> display factor (utils.bank_store.display_factors)
+        """
+        self.index = TickerIndex(store, sort_by='PERIOD')
+        self.names = names or {}
+        self.factors = factors or {}
+        self._period_rows = {int(p): rows for p, rows in self.index.frame.groupby('PERIOD').indices.items()}
+
+    def keycodes(self, block) -> list:
+        """Keycodes of a block key, or a list of keycodes as given"""
+        return METRIC_BLOCKS[block][1] if isinstance(block, str) else list(block)
+
+    def _table(self, rows: pd.DataFrame, block, columns) -> pd.DataFrame:
+        table = rows.reindex(columns=self.keycodes(block)).T
+        table.columns = pd.Index(columns)
+        table = scale_rows(table, self.factors)
+        return table.rename(index=self.names)
+
+    def single(self, ticker: str, block, start_year: int = None) -> pd.DataFrame:
+        """
+        One bank over time
+
+        Args:
+            ticker (str): Ticker, or an aggregate such as 'INDUSTRY'
+            block (str | list): Block key or keycodes
+            start_year (int): First year to include
+
+        Returns:
+            pd.DataFrame: Keycode x period table (DATE labels as columns)
+        """
+        since = period_key(start_year, 1) if start_year is not None else None
+        rows = self.index.get(ticker, since=since)
+        return self._table(rows, block, rows['DATE'])
+
+    def multi(self, tickers, period: int, block) -> pd.DataFrame:
+        """
+        Several banks at one period
+
+        Args:
+            tickers (list): Tickers to include
+            period (int): Period key, e.g. 20251
+            block (str | list): Block key or keycodes
+
+        Returns:
+            pd.DataFrame: Keycode x ticker table, tickers in sorted order
+        """
+        rows = self.index.frame.iloc[self._period_rows.get(int(period), np.array([], dtype=np.intp))]
+        rows = rows[rows['TICKER'].isin(list(tickers)).to_numpy()]
+        return self._table(rows, block, rows['TICKER'].astype(str))
+
+    def history(self, tickers, keycodes, start_year: int = None) -> pd.DataFrame:
+        """
+        Several banks over time for several keycodes, for charting
+
+        Args:
+            tickers (list): Tickers, in legend order
+            keycodes (list): Keycodes, in panel order
+            start_year (int): First year to include
+
+        Returns:
+            pd.DataFrame: Period x (keycode, ticker) matrix of stored values, DATE labels as
+                          index in chronological order; tickers without data are NaN columns
+        """
+        frame = self.index.frame
+        tickers, keycodes = list(tickers), [k for k in keycodes if k in frame.columns]
+        mask = frame['TICKER'].isin(tickers).to_numpy()
+        if start_year is not None:
+            mask = mask & (frame['PERIOD'].to_numpy() >= period_key(start_year, 1))
+        # One filter and one pivot (which sorts by period) for the whole selection
+        wide = frame.loc[mask, ['PERIOD', 'TICKER', *keycodes]].pivot(index='PERIOD', columns='TICKER', values=keycodes)
+        wide = wide.reindex(columns=pd.MultiIndex.from_product([keycodes, tickers], names=['KEYCODE', 'TICKER']))
+        wide.index = pd.Index([period_label(p) for p in wide.index], name='DATE')
+        return wide
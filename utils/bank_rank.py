@@ -0,0 +1,101 @@
+"""
+Bank Peer Ranking Module
+Rank, percentile and z-score of every bank per period and keycode, within its group and system-wide
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.bank_query import BankQuery
+
+
+# Ranking scopes: peers in the bank's Classification.xlsx GROUP, or every classified bank
+RANK_SCOPES = {'GROUP': "Within group", 'SYSTEM': "System"}
+
+# Measures: rank 1 = highest value, percentile = share of peers at or below (0-100),
+# z-score = standard deviations from the peer mean
+RANK_MEASURES = {'rank': "Rank", 'pct': "Percentile", 'z': "Z-score"}
+
+# Keycode families ranked by default
+RANKED_PREFIXES = ('CA.', 'IS.')
+
+
+class PeerRanking:
+    """
+    Cross-sectional statistics of the classified banks (aggregate
+    pseudo-tickers such as INDUSTRY or SOCB are left out), computed for all
+    periods and keycodes with one groupby per scope. Each (scope, measure)
+    result has the shape of the bank store and is served through a
+    BankQuery, so lookups are the same slices as the value tables.
+
+    Attributes:
+        groups (pd.Series): Ticker -> GROUP
+        keycodes (list): Ranked keycodes
+    """
+
+    def __init__(self, store: pd.DataFrame, classification: pd.DataFrame, keycodes: list = None, names: dict = None):
+        """
+        Args:
+            store (pd.DataFrame): Typed bank store (utils.bank_store.load_bank_store)
+            classification (pd.DataFrame): TICKER and GROUP columns
+            keycodes (list): Keycodes to rank (defaults to every CA.* and IS.* column)
+            names (dict): Keycode -> display name for row labels
+        """
+        self.groups = classification.set_index('TICKER')['GROUP'].astype(str)
+        self.keycodes = keycodes or [c for c in store.columns if c.startswith(RANKED_PREFIXES)]
+
+        banks = store[store['TICKER'].isin(self.groups.index).to_numpy()].reset_index(drop=True)
+        ids = banks[['TICKER', 'PERIOD', 'DATE']]
+        values = banks[self.keycodes].astype(np.float64)
+        period = banks['PERIOD'].to_numpy()
+        group = banks['TICKER'].astype(str).map(self.groups).to_numpy()
+
+        self._queries = {}
+        for scope, by in {'GROUP': [period, group], 'SYSTEM': [period]}.items():
+            grouped = values.groupby(by)
+            measures = {
+                'rank': grouped.rank(ascending=False, method='min'),
+                'pct': grouped.rank(pct=True) * 100,
+                'z': (values - grouped.transform('mean')) / grouped.transform('std'),
+            }
+            for measure, frame in measures.items():
+                self._queries[(scope, measure)] = BankQuery(pd.concat([ids, frame], axis=1), names=names)
+
+    def single(self, ticker: str, keycodes: list, scope: str = 'GROUP', measure: str = 'pct',
+               start_year: int = None) -> pd.DataFrame:
+        """
+        One bank's standing over time
+
+        Args:
+            ticker (str): Classified bank ticker
+            keycodes (list): Keycodes (or a block key)
+            scope (str): 'GROUP' or 'SYSTEM'
+            measure (str): 'rank', 'pct' or 'z'
+            start_year (int): First year to include
+
+        Returns:
+            pd.DataFrame: Keycode x period table (empty for aggregates and unclassified tickers)
+        """
+        return self._queries[(scope, measure)].single(ticker, keycodes, start_year=start_year)
+
+    def multi(self, tickers, period: int, keycodes: list, scope: str = 'GROUP', measure: str = 'pct') -> pd.DataFrame:
+        """
+        Several banks' standing at one period
+
+        Args:
+            tickers (list): Tickers to include
+            period (int): Period key, e.g. 20251
+            keycodes (list): Keycodes (or a block key)
+            scope (str): 'GROUP' or 'SYSTEM'
+            measure (str): 'rank', 'pct' or 'z'
+
+        Returns:
+            pd.DataFrame: Keycode x ticker table
+        """
+        return self._queries[(scope, measure)].multi(tickers, period, keycodes)
+
+    def scope_size(self, scope: str, ticker: str = None) -> int:
+        """Largest number of banks ranked together in a scope (the ticker's group for GROUP)"""
+        if scope == 'SYSTEM':
+            return len(self.groups)
+        return int((self.groups == self.groups.get(ticker)).sum()) if ticker is not None else int(self.groups.value_counts().max())
@@ -0,0 +1,79 @@
+"""
+Bank Store Module
+Quarterly bank fundamentals as one typed numeric frame keyed by ticker and integer period
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.datastore import read_dataset
+
+
+# Keycode values are held in float64: amounts run to 8+ significant digits (VND bn with decimals,
+# VND in CA.*), which float32 would round in tables and hover labels
+VALUE_DTYPE = np.float64
+
+# Non-keycode columns of the bank CSV
+ID_COLUMNS = ('ORGANCODE', 'TICKER', 'YEARREPORT', 'LENGTHREPORT', 'PERIOD_INDEX')
+
+# CA.* amounts are stored in VND; BS/IS/Nt amounts are already in VND bn
+CA_AMOUNT_FACTOR = 1e-9
+
+
+def period_key(year, quarter):
+    """Integer period key, e.g. (2025, 1) -> 20251; sorts chronologically"""
+    return year * 10 + quarter
+
+
+def period_label(key: int) -> str:
+    """Display label of a period key, e.g. 20251 -> '2025Q1'"""
+    return f"{key // 10}Q{key % 10}"
+
+
+def load_bank_store(filename: str = "df_q_full.csv", value_dtype=VALUE_DTYPE) -> pd.DataFrame:
+    """
+    Load the bank CSV (comma-grouped numbers) into a typed frame
+
+    Args:
+        filename (str): CSV in the data directory
+        value_dtype: dtype of the keycode columns
+
+    Returns:
+        pd.DataFrame: Categorical TICKER/ORGANCODE, integer YEARREPORT/LENGTHREPORT,
+                      int32 PERIOD key, DATE label ('2025Q1') and one numeric
+                      column per keycode, in the CSV's row order
+    """
+    raw = read_dataset(filename, thousands=',')
+    values = raw.drop(columns=[c for c in ID_COLUMNS if c in raw.columns])
+    # Columns the parser left as text (stray characters in a cell) are coerced once here
+    text = values.select_dtypes(exclude='number').columns
+    if len(text):
+        values[text] = values[text].apply(pd.to_numeric, errors='coerce')
+
+    period = period_key(raw['YEARREPORT'], raw['LENGTHREPORT']).astype(np.int32)
+    keys = pd.DataFrame({
+        'ORGANCODE': raw['ORGANCODE'].astype('category'),
+        'TICKER': raw['TICKER'].astype('category'),
+        'YEARREPORT': raw['YEARREPORT'].astype(np.int16),
+        'LENGTHREPORT': raw['LENGTHREPORT'].astype(np.int8),
+        'PERIOD': period,
+        'DATE': period.map(period_label),
+    })
+    return pd.concat([keys, values.astype(value_dtype)], axis=1)
+
+
+def display_factors(mapping: pd.DataFrame) -> dict:
+    """
+    Display scaling of keycode rows from the mapping's Format column:
+    'pct' ratios x100, CA.* 'abs' amounts from VND to VND bn
+
+    Args:
+        mapping (pd.DataFrame): Keycode mapping with KeyCode and Format columns
+
+    Returns:
+        dict: Keycode -> factor (keycodes shown as stored are left out)
+    """
+    formats = mapping.set_index('KeyCode')['Format']
+    factors = {k: 100 for k in formats.index[formats == 'pct']}
+    factors.update({k: CA_AMOUNT_FACTOR for k in formats.index[(formats == 'abs') & formats.index.str.startswith('CA.')]})
+    return factors
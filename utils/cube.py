@@ -0,0 +1,113 @@
+"""
+Fundamentals Cube Module
+Dense ticker x keycode x period arrays of the long fundamentals table, built once at load
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FundamentalsCube:
+    """
+    Long KEYCODE/DATE rows pivoted once into dense float arrays, one per
+    field, indexed [ticker, keycode, period] with integer codes. Periods are
+    sorted, so a start year is a column offset.
+
+    Attributes:
+        tickers (pd.Index): Ticker labels (axis 0)
+        keycodes (pd.Index): Keycode labels (axis 1)
+        dates (pd.Index): Period labels, sorted (axis 2)
+        years (np.ndarray): Year of each period
+        fields (tuple): Value fields held, e.g. ('VALUE', 'YoY')
+    """
+
+    def __init__(self, df: pd.DataFrame, fields: tuple = ('VALUE', 'YoY'), ticker_col: str = 'TICKER',
+                 keycode_col: str = 'KEYCODE', date_col: str = 'DATE', year_col: str = 'YEAR'):
+        """
+        Args:
+            df (pd.DataFrame): Long table with one row per (ticker, keycode, date)
+            fields (tuple): Numeric columns to hold
+            ticker_col (str): Ticker column
+            keycode_col (str): Keycode column
+            date_col (str): Period column; its sort order must be chronological
+            year_col (str): Year of each row, used by since=
+        """
+        ticker_codes, self.tickers = pd.factorize(df[ticker_col])
+        keycode_codes, self.keycodes = pd.factorize(df[keycode_col])
+        date_codes, self.dates = pd.factorize(df[date_col], sort=True)
+        self.tickers.name, self.keycodes.name, self.dates.name = ticker_col, keycode_col, date_col
+
+        years = np.zeros(len(self.dates), dtype=np.int64)
+        years[date_codes] = df[year_col].to_numpy()
+        self.years = years
+
+        shape = (len(self.tickers), len(self.keycodes), len(self.dates))
+        self.fields = tuple(fields)
+        self._data = {}
+        for field in self.fields:
+            cube = np.full(shape, np.nan)
+            cube[ticker_codes, keycode_codes, date_codes] = pd.to_numeric(df[field], errors='coerce').to_numpy(np.float64)
+            self._data[field] = cube
+
+        self._ticker_pos = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._keycode_pos = {keycode: i for i, keycode in enumerate(self.keycodes)}
+
+    def __contains__(self, ticker) -> bool:
+        return ticker in self._ticker_pos
+
+    def array(self, field: str = 'VALUE') -> np.ndarray:
+        """Full [ticker, keycode, period] array of a field (read-only by convention)"""
+        return self._data[field]
+
+    def block(self, ticker: str, field: str = 'VALUE', keycodes: list = None, since=None,
+              dropna: bool = False) -> pd.DataFrame:
+        """
+        (keycode x date) block of one ticker, shaped like
+        df.pivot(index='KEYCODE', columns='DATE', values=field)
+
+        Args:
+            ticker (str): Ticker symbol
+            field (str): Field to read, e.g. 'VALUE' or 'YoY'
+            keycodes (list): Rows to return, in this order (None for all; unknown keycodes are NaN rows)
+            since (int): First year to include
+            dropna (bool): Also drop keycode rows with no data
+
+        Returns:
+            pd.DataFrame: Periods before the first and after the last data point are
+                          left out. Without keycodes or dropna, the frame wraps a view of the cube.
+        """
+        pos = self._ticker_pos.get(ticker)
+        start = int(np.searchsorted(self.years, since, side='left')) if since is not None else 0
+        if pos is None:
+            return pd.DataFrame(index=pd.Index(keycodes or [], name=self.keycodes.name),
+                                columns=self.dates[:0], dtype=np.float64)
+
+        block = self._data[field][pos, :, start:]
+        if keycodes is not None:
+            rows = np.array([self._keycode_pos.get(k, -1) for k in keycodes], dtype=np.int64)
+            block = np.where((rows >= 0)[:, None], block[rows], np.nan)
+        # Trim periods before the ticker's first and after its last data point
+        filled = np.flatnonzero(~np.isnan(block).all(axis=0))
+        lo, hi = (filled[0], filled[-1] + 1) if len(filled) else (0, 0)
+
+        frame = pd.DataFrame(block[:, lo:hi], columns=self.dates[start + lo:start + hi], copy=False,
+                             index=self.keycodes if keycodes is None else pd.Index(keycodes, name=self.keycodes.name))
+        if dropna:
+            frame = frame[frame.notna().any(axis=1).to_numpy()]
+        return frame
+
+    def cross_section(self, keycode: str, date, field: str = 'VALUE') -> pd.Series:
+        """
+        One keycode at one period across every ticker
+
+        Args:
+            keycode (str): Keycode, e.g. 'NPATMI'
+            date: Period label
+            field (str): Field to read
+
+        Returns:
+            pd.Series: Values indexed by ticker
+        """
+        k = self._keycode_pos[keycode]
+        d = self.dates.get_loc(date)
+        return pd.Series(self._data[field][:, k, d], index=self.tickers, name=keycode)
@@ -0,0 +1,144 @@
+"""
+Dataset Store Module
+Columnar Arrow IPC cache of the processed CSVs, rebuilt when a CSV changes and read memory-mapped
+"""
+
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils.utils import get_data_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # Optional: plain CSV reads without it
+    pa = None
+
+
+# Arrow files live next to the CSVs; safe to delete, they are rebuilt on demand
+CACHE_DIR = get_data_path(".cache")
+
+# Bump to invalidate every cached file after a change to the cache layout
+CACHE_VERSION = "1"
+
+
+def _fingerprint(csv_path, read_options: dict) -> dict:
+    stat = os.stat(csv_path)
+    return {
+        'version': CACHE_VERSION,
+        'mtime_ns': str(stat.st_mtime_ns),
+        'size': str(stat.st_size),
+        'read_options': json.dumps(read_options, sort_keys=True, default=str),
+    }
+
+
+def _cache_path(filename: str, read_options: dict):
+    # Different read options of the same CSV get their own file
+    key = zlib.crc32(json.dumps(read_options, sort_keys=True, default=str).encode()) if read_options else 0
+    return CACHE_DIR / f"{os.path.splitext(filename)[0]}-{key:08x}.arrow"
+
+
+def _is_current(path, fingerprint: dict) -> bool:
+    try:
+        with pa.memory_map(str(path)) as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return all(metadata.get(k.encode()) == v.encode() for k, v in fingerprint.items())
+
+
+def _read_csv(csv_path, read_options: dict, sort_by: list) -> pd.DataFrame:
+    df = pd.read_csv(csv_path, **read_options)
+    if sort_by:
+        df = df.sort_values(sort_by, kind='stable', ignore_index=True)
+    return df
+
+
+def _build(csv_path, path, fingerprint: dict, read_options: dict, sort_by: list) -> pd.DataFrame:
+    df = _read_csv(csv_path, read_options, sort_by)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns cannot be stored as Arrow; keep using the CSV
+        return df
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **fingerprint})
+
+    # Uncompressed IPC file, written atomically, so readers can map it directly
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    return df
+
+
+def read_dataset(filename: str, sort_by=None, **read_options) -> pd.DataFrame:
+    """
+    Read a CSV from the data directory through the columnar cache.
+    The first read (and any read after the CSV's mtime or size changes)
+    parses the CSV and writes an Arrow IPC file; later reads memory-map that
+    file, so typed columns come straight from the page cache shared by all
+    server processes. Without pyarrow this is pd.read_csv.
+
+    Rows can be stored pre-sorted (e.g. by ticker then date), so a
+    TickerIndex over the result needs no sorted copy of its own.
+
+    Args:
+        filename (str): File name in the data directory, e.g. 'FA_processed.csv'
+        sort_by (str | list): Column(s) to stably sort rows by before caching (part of the cache key)
+        **read_options: pd.read_csv options (part of the cache key)
+
+    Returns:
+        pd.DataFrame: The dataset
+    """
+    csv_path = get_data_path(filename)
+    sort_by = [sort_by] if isinstance(sort_by, str) else list(sort_by or [])
+    if pa is None:
+        return _read_csv(csv_path, read_options, sort_by)
+
+    key_options = {**read_options, 'sort_by': sort_by} if sort_by else read_options
+    path = _cache_path(filename, key_options)
+    fingerprint = _fingerprint(csv_path, key_options)
+    if not _is_current(path, fingerprint):
+        return _build(csv_path, path, fingerprint, read_options, sort_by)
+
+    # The mapping stays open for as long as the table's buffers are referenced
+    table = ipc.open_file(pa.memory_map(str(path))).read_all()
+    # split_blocks lets numeric columns without nulls stay zero-copy views of the mapping
+    return table.to_pandas(split_blocks=True)
+
+
+def dataset_version(filename: str) -> str:
+    """
+    Version of a CSV in the data directory (modification time and size), for
+    keying caches of objects derived from it
+
+    Args:
+        filename (str): File name in the data directory
+
+    Returns:
+        str: Changes whenever the file is replaced or edited
+    """
+    stat = os.stat(get_data_path(filename))
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def read_datasets(*specs, max_workers: int = 4) -> list:
+    """
+    Read several datasets concurrently
+
+    Args:
+        *specs: File names, or (file name, read_options dict) tuples
+        max_workers (int): Maximum concurrent reads
+
+    Returns:
+        list: DataFrames in the order of specs
+    """
+    specs = [(spec, {}) if isinstance(spec, str) else spec for spec in specs]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as pool:
+        futures = [pool.submit(read_dataset, filename, **options) for filename, options in specs]
+        return [future.result() for future in futures]
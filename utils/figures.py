@@ -0,0 +1,79 @@
+"""
+Figure Templates Module
+Styled subplot layouts built once per chart shape and filled with trace data at render time
+"""
+
+import copy
+from functools import lru_cache
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Render-mode switch shared with the ssi price charts
+from ssi.render import RENDER_MODE, WEBGL_THRESHOLD, scatter_type, use_webgl
+
+
+def axis_refs(row: int, col: int, cols: int = 1) -> dict:
+    """
+    Axis references of a subplot cell, for traces added without make_subplots
+
+    Args:
+        row (int): 1-based row
+        col (int): 1-based column
+        cols (int): Number of columns in the grid
+
+    Returns:
+        dict: {'xaxis': 'x<n>', 'yaxis': 'y<n>'}
+    """
+    idx = (row - 1) * cols + col
+    suffix = '' if idx == 1 else str(idx)
+    return {'xaxis': f"x{suffix}", 'yaxis': f"y{suffix}"}
+
+
+@lru_cache(maxsize=128)
+def grid_template(rows: int, cols: int, subplot_titles: tuple = (), height: int = None, width: int = 1200,
+                  vertical_spacing: float = None, yaxis_suffix: str = '', template: str = None,
+                  shared_xaxes: bool = False) -> dict:
+    """
+    Build (once per shape) the layout of a rows x cols subplot grid
+
+    Args:
+        rows (int): Grid rows
+        cols (int): Grid columns
+        subplot_titles (tuple): Title of each cell, row by row
+        height (int): Figure height in pixels
+        width (int): Figure width in pixels
+        vertical_spacing (float): Space between rows, as a fraction of the height
+        yaxis_suffix (str): Tick suffix of every y axis, e.g. '%'
+        template (str): Plotly template name
+        shared_xaxes (bool): Link the x axes of the cells in each column
+
+    Returns:
+        dict: Layout; treat as read-only and pass to build_figure()
+    """
+    fig = make_subplots(rows=rows, cols=cols, subplot_titles=list(subplot_titles) or None,
+                        vertical_spacing=vertical_spacing, shared_xaxes=shared_xaxes)
+    fig.update_layout(showlegend=False, height=height, width=width, template=template)
+    if yaxis_suffix:
+        fig.update_yaxes(ticksuffix=yaxis_suffix)
+    return fig.layout.to_plotly_json()
+
+
+def build_figure(layout: dict, traces: list, **layout_updates) -> go.Figure:
+    """
+    Create a figure from a prebuilt layout and plain trace dicts.
+    The layout was validated when the template was built and traces hold
+    NumPy arrays, so the figure is assembled without plotly's per-property
+    validation.
+
+    Args:
+        layout (dict): Layout from a template builder (copied, never modified)
+        traces (list): Trace dicts, e.g. {'type': 'bar', 'x': ..., 'y': ..., 'xaxis': 'x2', 'yaxis': 'y2'}
+        **layout_updates: Top-level layout keys to set, e.g. title={'text': ...}
+
+    Returns:
+        go.Figure: Plotly figure object
+    """
+    layout = copy.deepcopy(layout)
+    layout.update(layout_updates)
+    return go.Figure(data=traces, layout=layout, _validate=False)
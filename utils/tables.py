@@ -0,0 +1,101 @@
+"""
+Table Presentation Module
+Numeric metric tables rendered with column-level number formats, units in the row labels
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+def scale_rows(table: pd.DataFrame, factors: dict) -> pd.DataFrame:
+    """
+    Multiply selected rows of a metric x period table, e.g. ratios by 100
+
+    Args:
+        table (pd.DataFrame): Metrics as rows
+        factors (dict): Row label -> factor; other rows are unchanged
+
+    Returns:
+        pd.DataFrame: New table with float values
+    """
+    row_factors = np.array([factors.get(label, 1.0) for label in table.index], dtype=np.float64)
+    if (row_factors == 1.0).all():
+        return table
+    numeric = table.select_dtypes('number').columns
+    scaled = table.copy()
+    scaled[numeric] = table[numeric].to_numpy(np.float64) * row_factors[:, None]
+    return scaled
+
+
+def with_units(table: pd.DataFrame, units) -> pd.DataFrame:
+    """
+    Append units to the row labels, e.g. 'Net_Revenue' -> 'Net_Revenue (bn)'
+
+    Args:
+        table (pd.DataFrame): Metrics as rows
+        units (str | dict): One unit for every row, or row label -> unit
+
+    Returns:
+        pd.DataFrame: Table with relabelled rows
+    """
+    if not units:
+        return table
+    if isinstance(units, str):
+        return table.rename(index=lambda label: f"{label} ({units})")
+    return table.rename(index=lambda label: f"{label} ({units[label]})" if units.get(label) else label)
+
+
+def number_config(table: pd.DataFrame, fmt: str = "%,.1f") -> dict:
+    """
+    Column config giving every numeric column the same number format
+
+    Args:
+        table (pd.DataFrame): Table to display
+        fmt (str): printf-style format, e.g. '%,.1f' (',' adds thousand separators)
+
+    Returns:
+        dict: column_config for st.dataframe
+    """
+    return {str(col): st.column_config.NumberColumn(format=fmt) for col in table.select_dtypes('number').columns}
+
+
+def show_table(table: pd.DataFrame, units=None, fmt: str = "%,.1f", **kwargs) -> None:
+    """
+    Display a metric table: values stay floats (sortable, sent as numbers),
+    formatting is one setting per column and units go in the row labels
+
+    Args:
+        table (pd.DataFrame): Metrics as rows, already scaled
+        units (str | dict): Units for the row labels (see with_units)
+        fmt (str): printf-style number format for all numeric columns
+        **kwargs: Passed on to st.dataframe
+    """
+    # Column labels go out as plain strings (e.g. periods, or tickers from a categorical column)
+    table = table.set_axis(table.columns.astype(str), axis=1)
+    st.dataframe(with_units(table, units), column_config=number_config(table, fmt), **kwargs)
+
+
+def show_heat_table(table: pd.DataFrame, vmin: float, vmax: float, fmt: str = "{:.2f}", reverse: bool = False,
+                    **kwargs) -> None:
+    """
+    Display a table with cells shaded by value between vmin and vmax
+
+    Args:
+        table (pd.DataFrame): Numeric table
+        vmin (float): Value shaded lightest (darkest with reverse)
+        vmax (float): Value shaded darkest (lightest with reverse)
+        fmt (str): str.format pattern of the cells
+        reverse (bool): Shade low values darkest, e.g. rank 1
+        **kwargs: Passed on to st.dataframe
+    """
+    width = (vmax - vmin) or 1
+
+    def shade(value):
+        if pd.isna(value):
+            return ''
+        level = min(max((value - vmin) / width, 0.0), 1.0)
+        return f"background-color: rgba(31, 119, 180, {0.8 * (1 - level if reverse else level):.2f})"
+
+    table = table.set_axis(table.columns.astype(str), axis=1)
+    st.dataframe(table.style.map(shade).format(fmt, na_rep=''), **kwargs)
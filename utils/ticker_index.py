@@ -0,0 +1,85 @@
+"""
+Ticker Index Module
+Fact tables sorted once by ticker so per-ticker rows are contiguous, zero-copy slices
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class TickerIndex:
+    """
+    A fact table grouped by ticker. Rows are sorted by ticker (then by
+    sort_by) once at build time, and each ticker maps to a (start, stop)
+    row range, so get() is a dict lookup plus a positional slice instead of
+    a boolean scan and copy of the whole table. A table that is already in
+    that order (e.g. read with utils.datastore.read_dataset(sort_by=...))
+    is indexed in place, without a sorted copy.
+
+    Slices share memory with the indexed frame: treat them as read-only
+    and use assign()/copy() before changing values.
+
+    Attributes:
+        frame (pd.DataFrame): The sorted table (the given frame's data when it was already sorted)
+        tickers (np.ndarray): Tickers in order of first appearance in the source table
+    """
+
+    def __init__(self, df: pd.DataFrame, ticker_col: str = 'TICKER', sort_by=None):
+        """
+        Args:
+            df (pd.DataFrame): Fact table with one or more rows per ticker
+            ticker_col (str): Ticker column
+            sort_by (str | list): Column(s) to order rows within a ticker;
+                                  the first one is used by get(..., since=...)
+        """
+        self.ticker_col = ticker_col
+        self.sort_by = [sort_by] if isinstance(sort_by, str) else list(sort_by or [])
+        self.tickers = pd.unique(df[ticker_col].to_numpy())
+
+        columns = [ticker_col] + self.sort_by
+        if pd.MultiIndex.from_frame(df[columns]).is_monotonic_increasing:
+            # Shares the columns (copy-on-write): memory-mapped data stays mapped
+            self.frame = df.reset_index(drop=True)
+        else:
+            self.frame = df.sort_values(columns, kind='stable').reset_index(drop=True)
+        keys = self.frame[ticker_col].to_numpy()
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=int)
+        stops = np.append(starts[1:], len(keys))
+        self._ranges = {keys[start]: (start, stop) for start, stop in zip(starts, stops)}
+        self._since_values = self.frame[self.sort_by[0]].to_numpy() if self.sort_by else None
+
+    def __contains__(self, ticker) -> bool:
+        return ticker in self._ranges
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def bounds(self, ticker, since=None) -> tuple:
+        """
+        Row range of one ticker in the indexed frame, for arrays aligned with it
+
+        Args:
+            ticker (str): Ticker symbol
+            since: Start at the first row whose first sort_by column is >= since (None keeps all)
+
+        Returns:
+            tuple: (start, stop) positions; (0, 0) if the ticker is unknown
+        """
+        start, stop = self._ranges.get(ticker, (0, 0))
+        if since is not None and self._since_values is not None and stop > start:
+            start += int(np.searchsorted(self._since_values[start:stop], since, side='left'))
+        return start, stop
+
+    def get(self, ticker, since=None) -> pd.DataFrame:
+        """
+        Rows of one ticker
+
+        Args:
+            ticker (str): Ticker symbol
+            since: Keep rows whose first sort_by column is >= since (None keeps all)
+
+        Returns:
+            pd.DataFrame: Zero-copy slice of the indexed frame (empty if the ticker is unknown)
+        """
+        start, stop = self.bounds(ticker, since)
+        return self.frame.iloc[start:stop]
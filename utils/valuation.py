@@ -0,0 +1,147 @@
+"""
+Valuation Statistics Module
+Per-ticker valuation multiple statistics and rolling bands, computed once for all tickers
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.ticker_index import TickerIndex
+
+
+VALUATION_METRICS = ('P/E', 'P/B', 'P/S', 'EV/EBITDA')
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Rolling band windows (calendar days of trading history) and the history required before a band starts
+ROLLING_WINDOWS = {'3Y': '1095D', '5Y': '1826D'}
+ROLLING_MIN_PERIODS = 120
+
+
+class ValuationStats:
+    """
+    Valuation multiples of every ticker, forward-filled per ticker as
+    charted, with statistics computed in one groupby pass over the whole
+    table. Per-ticker reads are lookups: a row of the statistics table, or
+    a row range of the series aligned with the ticker index.
+
+    Attributes:
+        index (TickerIndex): Valuation history indexed by ticker, sorted by date
+        metrics (list): Multiples held, e.g. ['P/E', 'P/B', 'P/S', 'EV/EBITDA']
+        dates (np.ndarray): Trade date of each indexed row
+        values (pd.DataFrame): Forward-filled multiples, aligned with index.frame
+        table (pd.DataFrame): One row per ticker, (metric, stat) columns: latest,
+                              mean, std, count, p10 ... p90 and pct_rank of the latest
+                              value within the ticker's history (0-100)
+        windows (dict): Rolling band label -> window
+    """
+
+    def __init__(self, index: TickerIndex, metrics: tuple = VALUATION_METRICS, date_col: str = 'TRADE_DATE',
+                 windows: dict = None, min_periods: int = ROLLING_MIN_PERIODS):
+        """
+        Args:
+            index (TickerIndex): Valuation table indexed by ticker with sort_by=date_col
+            metrics (tuple): Multiple columns; missing ones are skipped
+            date_col (str): Trade date column
+            windows (dict): Rolling band label -> pandas offset (defaults to ROLLING_WINDOWS)
+            min_periods (int): Observations required before a rolling band starts
+        """
+        frame = index.frame
+        self.index = index
+        self.metrics = [m for m in metrics if m in frame.columns]
+        self.dates = pd.to_datetime(frame[date_col]).to_numpy()
+        self.windows = dict(ROLLING_WINDOWS if windows is None else windows)
+
+        tickers = frame[index.ticker_col].to_numpy()
+        raw = frame[self.metrics].apply(pd.to_numeric, errors='coerce')
+        self.values = raw.groupby(tickers, sort=False).ffill()
+        self.table = self._summarize(self.values, tickers)
+        self._bands = {label: self._rolling(tickers, window, min_periods) for label, window in self.windows.items()}
+
+    @staticmethod
+    def _summarize(values: pd.DataFrame, tickers: np.ndarray) -> pd.DataFrame:
+        grouped = values.groupby(tickers, sort=False)
+        latest = grouped.last()
+        count = grouped.count()
+        # Share of the ticker's history at or below its latest value
+        at_or_below = values.le(grouped.transform('last')).groupby(tickers, sort=False).sum()
+        stats = {
+            'latest': latest,
+            'mean': grouped.mean(),
+            'std': grouped.std(),
+            'count': count,
+            'pct_rank': (at_or_below / count.where(count > 0)) * 100,
+        }
+        quantiles = grouped.quantile(list(PERCENTILES)).unstack()
+        for q in PERCENTILES:
+            stats[f"p{round(q * 100)}"] = quantiles.xs(q, axis=1, level=1)
+
+        table = pd.concat(stats, axis=1).swaplevel(axis=1)
+        table.index.name = 'TICKER'
+        return table[[(m, stat) for m in values.columns for stat in stats]]
+
+    def _rolling(self, tickers: np.ndarray, window: str, min_periods: int) -> dict:
+        rolling = (self.values.assign(_date=self.dates)
+                   .groupby(tickers, sort=False)
+                   .rolling(window, on='_date', min_periods=min_periods))
+        # Groups come back in index order (rows are contiguous per ticker)
+        mean = rolling.mean().drop(columns='_date').droplevel(0).sort_index()
+        std = rolling.std().drop(columns='_date').droplevel(0).sort_index()
+        return {'mean': mean.to_numpy(), 'std': std.to_numpy()}
+
+    def __contains__(self, ticker) -> bool:
+        return ticker in self.table.index
+
+    def latest(self, ticker: str) -> dict:
+        """
+        Last non-null value of each multiple
+
+        Args:
+            ticker (str): Ticker symbol
+
+        Returns:
+            dict: Metric -> float, or None without data
+        """
+        if ticker not in self.table.index:
+            return {m: None for m in self.metrics}
+        row = self.table.loc[ticker]
+        return {m: (None if pd.isna(row[(m, 'latest')]) else float(row[(m, 'latest')])) for m in self.metrics}
+
+    def summary(self, ticker: str) -> pd.DataFrame:
+        """
+        Statistics of one ticker as a (metric x stat) table
+
+        Args:
+            ticker (str): Ticker symbol
+
+        Returns:
+            pd.DataFrame: Empty if the ticker has no valuation data
+        """
+        if ticker not in self.table.index:
+            return pd.DataFrame(index=pd.Index(self.metrics, name='METRIC'))
+        summary = self.table.loc[ticker].unstack()
+        summary.index.name = 'METRIC'
+        return summary.reindex(self.metrics)
+
+    def bands(self, ticker: str, metric: str, window: str = None) -> pd.DataFrame:
+        """
+        Daily series of a multiple with its band centre and width
+
+        Args:
+            ticker (str): Ticker symbol
+            metric (str): Multiple, e.g. 'P/E'
+            window (str): Rolling window label from windows, or None for the full-history mean/std
+
+        Returns:
+            pd.DataFrame: 'value', 'mean' and 'std' columns indexed by trade date
+        """
+        start, stop = self.index.bounds(ticker)
+        col = self.metrics.index(metric)
+        value = self.values[metric].to_numpy()[start:stop]
+        if window is None:
+            mean = np.full(stop - start, self.table[(metric, 'mean')].get(ticker, np.nan))
+            std = np.full(stop - start, self.table[(metric, 'std')].get(ticker, np.nan))
+        else:
+            mean = self._bands[window]['mean'][start:stop, col]
+            std = self._bands[window]['std'][start:stop, col]
+        return pd.DataFrame({'value': value, 'mean': mean, 'std': std},
+                            index=pd.Index(self.dates[start:stop], name='TRADE_DATE'))